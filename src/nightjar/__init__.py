@@ -6,6 +6,7 @@ from nightjar.base import (
     register,
 )
 from nightjar.registry import Field
+from nightjar.startup import WarmupReport, warmup
 
 __version__ = "0.0.6"
 
@@ -14,6 +15,8 @@ __all__ = [
     "BaseConfig",
     "BaseModule",
     "Field",
+    "WarmupReport",
     "dispatch",
     "register",
+    "warmup",
 ]
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import argparse
+import sys
+
+from nightjar.compiler import compile_module
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m nightjar")
+    commands = parser.add_subparsers(dest="command", required=True)
+    compile_parser = commands.add_parser(
+        "compile",
+        help="generate precompiled from_dict/to_dict functions for a module",
+    )
+    compile_parser.add_argument(
+        "module", help="importable name of the module with the config classes"
+    )
+    compile_parser.add_argument(
+        "-o",
+        "--output",
+        help="path of the generated module (defaults to standard output)",
+    )
+    args = parser.parse_args(argv)
+    try:
+        source = compile_module(args.module)
+    except (ImportError, ValueError) as e:
+        parser.error(str(e))
+    if args.output is None:
+        sys.stdout.write(source)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(source)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
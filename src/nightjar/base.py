@@ -2,16 +2,27 @@ from __future__ import annotations
 
 import abc
 import contextlib
+import copyreg
+import functools
+import importlib
+import operator
 from collections import defaultdict
 from collections.abc import Callable, Mapping
-from dataclasses import dataclass, fields, is_dataclass
-from typing import Any, Generator, Generic, Type, TypeVar
+from dataclasses import MISSING, Field, dataclass, fields, is_dataclass
+from typing import IO, Any, Generator, Generic, Type, TypeVar
 
 from typing_extensions import Self, dataclass_transform
 
+from nightjar.fingerprint import (
+    _without_cache,
+    fingerprint,
+    invalidate_fingerprint,
+)
+from nightjar.jsonio import from_json
+from nightjar.overlay import overlay
 from nightjar.registry import DispatchRegistry
-from nightjar.serializers import from_dict, to_dict
-from nightjar.utils import get_annotations
+from nightjar.serializers import LazyValue, from_dict, to_dict
+from nightjar.utils import get_annotations, get_entry_points, qualname
 
 __all__ = ["AttributeMap", "BaseConfig", "BaseModule"]
 
@@ -20,15 +31,62 @@ V = TypeVar("V")
 T = TypeVar("T")
 DType = TypeVar("DType", bound="dict[Type[BaseConfig], set[Type[BaseModule]]]")
 
+MODULE_PLUGIN_GROUP = "nightjar.modules"
+
 dispatch_map: DType = defaultdict(set)
 
+# qualified config class name -> module providing its BaseModule
+module_providers: dict[str, str] = {}
+
+
+def add_module_provider(
+    config_class: Type[BaseConfig] | str, module: str
+) -> None:
+    """Declare the module that defines the module class for a config.
+
+    The module is imported on demand the first time a module class is
+    requested for the config class.
+
+    Parameters
+    ----------
+    config_class : type or str
+        The config class, or its fully qualified name.
+    module : str
+        Importable name of the module defining the module class.
+    """
+    if not isinstance(config_class, str):
+        config_class = qualname(config_class)
+    module_providers[config_class] = module
+
+
+@functools.lru_cache(maxsize=None)
+def _load_module_entry_points() -> None:
+    for name, module in get_entry_points(MODULE_PLUGIN_GROUP).items():
+        module_providers.setdefault(name, module)
+
+
+def _import_module_provider(config_class: Type[BaseConfig]) -> bool:
+    _load_module_entry_points()
+    name = qualname(config_class)
+    module = module_providers.get(name)
+    if module is None:
+        return False
+    importlib.import_module(module)
+    # removed only once imported, so failed imports are retried
+    module_providers.pop(name, None)
+    return True
+
 
 def get_model_class(
     config_class: Type[BaseConfig] | BaseConfig,
 ) -> Type[BaseModule]:
     if isinstance(config_class, BaseConfig):
         config_class = type(config_class)
-    candidates = dispatch_map[config_class]
+    # overlay views dispatch to the modules of the config class they wrap
+    config_class = getattr(config_class, "__overlay_of__", config_class)
+    candidates = dispatch_map.get(config_class)
+    if not candidates and _import_module_provider(config_class):
+        candidates = dispatch_map.get(config_class)
     if not candidates:
         msg = f"No registered module for config type {config_class.__name__}"
         raise ValueError(msg)
@@ -38,6 +96,84 @@ def get_model_class(
     return next(iter(candidates))
 
 
+@functools.lru_cache(maxsize=None)
+def _config_annotation(cls: type) -> Any:
+    # config class declared by a module class, None if not declared
+    return get_annotations(cls).get("config", None)
+
+
+# methods that replace the compact pickling of a config class
+_PICKLE_METHODS = frozenset((
+    "__reduce__",
+    "__reduce_ex__",
+    "__getstate__",
+    "__setstate__",
+))
+
+
+def _pickle_methods(names: tuple[str, ...]) -> tuple[Callable, Callable]:
+    # the field values are pickled as a tuple in field order, and the
+    # instance is created by the NEWOBJ opcode of pickle without __init__
+    n = len(names)
+    if n == 1:
+        get = lambda state: (state[names[0]],)  # noqa: E731
+    elif n:
+        get = operator.itemgetter(*names)
+    else:
+        get = lambda state: ()  # noqa: E731
+
+    def reduce_ex(self: Any, protocol: int) -> tuple:
+        state = self.__dict__
+        if len(state) != n:
+            state = self.__getstate__()
+        if len(state) == n:
+            try:
+                return (copyreg.__newobj__, (type(self),), get(state))
+            except KeyError:
+                pass
+        # unset fields or instance state besides the fields
+        return (copyreg.__newobj__, (type(self),), state)
+
+    def setstate(self: Any, state: tuple | dict[str, Any]) -> None:
+        if type(state) is tuple:
+            state = zip(names, state)
+        self.__dict__.update(state)
+
+    return reduce_ex, setstate
+
+
+class LazyField:
+    """Data descriptor that decodes a lazily loaded field on first access.
+
+    Parameters
+    ----------
+    field : dataclasses.Field
+        The dataclass field managed by this descriptor.
+    """
+
+    def __init__(self, field: Field) -> None:
+        self.name = field.name
+        self.default = field.default
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            # mimic the class attribute that dataclass leaves behind
+            if self.default is MISSING:
+                raise AttributeError(self.name)
+            return self.default
+        try:
+            value = instance.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+        if isinstance(value, LazyValue):
+            value = value.get()
+            instance.__dict__[self.name] = value
+        return value
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        instance.__dict__[self.name] = value
+
+
 @dataclass_transform()
 class AttributeMapMeta(abc.ABCMeta):
     _dispatch_registry: DispatchRegistry
@@ -51,15 +187,31 @@ class AttributeMapMeta(abc.ABCMeta):
         **kwargs,
     ):
         dispatch = kwargs.pop("dispatch", None)
+        plugins = kwargs.pop("plugins", None)
+        lazy = kwargs.pop("lazy", None)
         klass = super().__new__(mcls, name, bases, namespace)
         klass = dataclass(**kwargs)(klass)
+        if lazy is None:
+            lazy = getattr(klass, "__lazy__", False)
+        klass.__lazy__ = lazy
+        if lazy:
+            for field in fields(klass):
+                setattr(klass, field.name, LazyField(field))
+        if _PICKLE_METHODS.isdisjoint(namespace):
+            names = tuple(f.name for f in fields(klass))
+            klass.__reduce_ex__, klass.__setstate__ = _pickle_methods(names)
+        elif "__reduce_ex__" not in namespace:
+            # the methods of the class take precedence
+            klass.__reduce_ex__ = object.__reduce_ex__
         has_config_base = False
         with contextlib.suppress(Exception):
             has_config_base = BaseConfig in bases
         if hasattr(klass, "_dispatch_registry"):
             klass._dispatch_registry.register(klass)
         elif has_config_base:
-            klass._dispatch_registry = DispatchRegistry(dispatch)
+            klass._dispatch_registry = DispatchRegistry(
+                dispatch, plugins=plugins
+            )
         return klass
 
 
@@ -73,10 +225,19 @@ class AttributeMap(Mapping[K, V], Generic[K, V], metaclass=AttributeMapMeta):
         field_types = {field.name: field.type for field in fields(self)}
         cls = field_types[__name]
         val = __value
-        if is_dataclass(cls) and not isinstance(val, cls):
+        if (
+            is_dataclass(cls)
+            and not isinstance(val, cls)
+            and not isinstance(val, LazyValue)
+        ):
             val = cls(**__value)
+        invalidate_fingerprint(self)
         return super().__setattr__(__name, val)
 
+    def __getstate__(self) -> dict[str, Any]:
+        # cached fingerprints are not part of the pickled state
+        return _without_cache(self.__dict__)
+
     def __iter__(self) -> Generator[str, None, None]:
         yield from to_dict(self)
 
@@ -86,10 +247,38 @@ class AttributeMap(Mapping[K, V], Generic[K, V], metaclass=AttributeMapMeta):
     def to_dict(self) -> dict[str, Any]:
         return to_dict(self)
 
+    def fingerprint(self) -> str:
+        """Return a stable content fingerprint of the config.
+
+        See Also
+        --------
+        nightjar.fingerprint.fingerprint
+        """
+        return fingerprint(self)
+
+    def overlay(self, overrides: Mapping[str, Any]) -> Self:
+        """Return a view of the config with some fields overridden.
+
+        See Also
+        --------
+        nightjar.overlay.overlay
+        """
+        return overlay(self, overrides)
+
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> Self:
         return from_dict(cls, data)
 
+    @classmethod
+    def from_json(cls, data: str | bytes | bytearray | IO) -> Self:
+        """Decode a JSON document directly into a config.
+
+        See Also
+        --------
+        nightjar.jsonio.from_json
+        """
+        return from_json(cls, data)
+
 
 class BaseConfig(AttributeMap): ...
 
@@ -121,7 +310,7 @@ class BaseModule:
     def config(self, value: BaseConfig | dict) -> None:
         if not isinstance(value, BaseConfig):
             cls = type(self)
-            config_class = get_annotations(cls).get("config", None)
+            config_class = _config_annotation(cls)
             if config_class is None:
                 msg = f"Could not determine config class for {cls.__name__}"
                 raise ValueError(msg)
@@ -137,13 +326,16 @@ class AutoModule:
             if not isinstance(config, Mapping):
                 msg = f"Expected config to be a Mapping or BaseConfig, got {type(config).__name__}"
                 raise ValueError(msg)
-            base_config_class = get_annotations(cls).get("config", None)
+            base_config_class = _config_annotation(cls)
             if base_config_class is None:
                 msg = f"Could not determine config class for {cls.__name__}"
                 raise ValueError(msg)
             config_class = from_dict(base_config_class, config)
             config_class = type(config)
-        if config_class in dispatch_map:
+        config_class = getattr(config_class, "__overlay_of__", config_class)
+        if config_class in dispatch_map or _import_module_provider(
+            config_class
+        ):
             klass = get_model_class(config_class)
             self = super().__new__(klass)
             self.__init__(config)
@@ -0,0 +1,397 @@
+from __future__ import annotations
+
+import ast
+import functools
+import hashlib
+import importlib
+import inspect
+from dataclasses import MISSING, fields
+from types import ModuleType
+from typing import Any, Dict, List, Mapping, Union, get_args, get_origin
+
+from nightjar.registry import _getattr, _is_true
+from nightjar.utils import get_dataclass_type_hints, qualname
+
+try:
+    from types import UnionType
+except ImportError:
+    from typing import Union as UnionType
+
+__all__ = ["class_signature", "compile_module", "field_type_hint"]
+
+NoneType = type(None)
+
+_HEADER = "\n".join([
+    '"""Generated by ``python -m nightjar compile {module}``.',
+    "",
+    "Do not edit. Regenerate this module whenever the config classes change.",
+    "The compiled functions are only used while the signature of the source",
+    "classes matches, otherwise the dynamic nightjar path is used instead.",
+    '"""',
+    "",
+    "from nightjar.compiler import class_signature as _class_signature",
+    "from nightjar.compiler import field_type_hint as _field_type_hint",
+    "from nightjar.serializers import from_dict as _from_dict",
+    "from nightjar.serializers import to_dict as _to_dict",
+])
+
+_RUNTIME = """
+
+
+def _enc(v):
+    t = type(v)
+    if t in _ATOMS:
+        return v
+    dump = _DUMPERS.get(t)
+    if dump is not None:
+        return dump(v)
+    if t is list:
+        return [_enc(x) for x in v]
+    if t is dict:
+        return {_enc(k): _enc(x) for k, x in v.items()}
+    return _to_dict(v)
+
+
+def from_dict(cls, data):
+    load = _LOADERS.get(cls) if VALID else None
+    if load is None:
+        return _from_dict(cls, data)
+    return load(data)
+
+
+def to_dict(obj):
+    dump = _DUMPERS.get(type(obj)) if VALID else None
+    if dump is None:
+        return _to_dict(obj)
+    return dump(obj)
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def field_type_hint(cls: type, name: str) -> Any:
+    """Return the (cached) type hint of a dataclass field."""
+    return get_dataclass_type_hints(cls)[name]
+
+
+def _is_config(cls: Any) -> bool:
+    return inspect.isclass(cls) and hasattr(cls, "_dispatch_registry")
+
+
+def _registry_root(cls: type) -> type:
+    for base in cls.__mro__:
+        if "_dispatch_registry" in base.__dict__:
+            return base
+    return cls
+
+
+def _config_types(hint: Any) -> list[type]:
+    if _is_config(hint):
+        return [hint]
+    return [t for arg in get_args(hint) for t in _config_types(arg)]
+
+
+def _collect(module: ModuleType) -> list[type]:
+    stack = [
+        obj
+        for obj in vars(module).values()
+        if _is_config(obj) and obj.__module__ == module.__name__
+    ]
+    stack.reverse()
+    seen: dict[type, None] = {}
+    while stack:
+        cls = stack.pop()
+        if cls in seen:
+            continue
+        seen[cls] = None
+        root = _registry_root(cls)
+        stack.append(root)
+        stack.extend(root._dispatch_registry.constraints)
+        for hint in get_dataclass_type_hints(cls).values():
+            stack.extend(_config_types(hint))
+    # classes that cannot be imported by name cannot be compiled
+    return [cls for cls in seen if "<locals>" not in cls.__qualname__]
+
+
+def class_signature(classes: list[type]) -> str:
+    """Compute a signature of the structure of config classes.
+
+    The signature covers the annotations, dispatch attribute values and
+    constraints of the classes but does not evaluate any annotation, so it
+    is cheap to compute when a compiled module is imported.
+
+    Parameters
+    ----------
+    classes : list of type
+        Config classes to compute the signature for.
+
+    Returns
+    -------
+    str
+        Hex digest of the signature.
+    """
+    h = hashlib.sha256()
+    for cls in classes:
+        h.update(qualname(cls).encode())
+        for base in reversed(cls.__mro__):
+            annotations = base.__dict__.get("__annotations__", {})
+            for name, hint in annotations.items():
+                if not isinstance(hint, str):
+                    hint = repr(hint)
+                h.update(f"{name}:{hint};".encode())
+        h.update(repr(getattr(cls, "__lazy__", False)).encode())
+        registry = cls._dispatch_registry
+        if cls not in registry.constraints:
+            # the root of a family is not dispatched to
+            continue
+        for a in registry.attrs:
+            value = _getattr(cls, a)
+            value = "*" if value is MISSING else repr(value)
+            h.update(f"{a}={value};".encode())
+        h.update(repr(_is_true(registry.constraints[cls])).encode())
+    return h.hexdigest()
+
+
+def _is_literal(value: Any) -> bool:
+    try:
+        return ast.literal_eval(repr(value)) == value
+    except (ValueError, SyntaxError):
+        return False
+
+
+class _Emitter:
+    def __init__(self, classes: list[type]) -> None:
+        self.classes = classes
+        self.index = {cls: i for i, cls in enumerate(classes)}
+        self.roots: dict[type, int] = {}
+        for cls in classes:
+            root = _registry_root(cls)
+            self.roots.setdefault(root, len(self.roots))
+        # family roots are not registered and never decoded themselves
+        self.members = [
+            cls for cls in classes if cls in cls._dispatch_registry.constraints
+        ]
+        self.lines: list[str] = []
+
+    def emit(self, line: str = "") -> None:
+        self.lines.append(line)
+
+    def decode_expr(self, hint: Any, var: str, depth: int) -> str | None:
+        if hint is Any:
+            return var
+        if isinstance(hint, type) and hint in {int, float, str, bool}:
+            return f"{hint.__name__}({var})"
+        if _is_config(hint):
+            root = _registry_root(hint)
+            if root not in self.roots:
+                return None
+            return f"_load_{self.roots[root]}({var})"
+        origin, args = get_origin(hint), get_args(hint)
+        item = f"_x{depth}"
+        if origin in {list, List} and len(args) == 1:
+            expr = self.decode_expr(args[0], item, depth + 1)
+            if expr is None:
+                return None
+            return f"[{expr} for {item} in {var}]"
+        if origin in {dict, Dict, Mapping} and len(args) == 2:
+            key = f"_k{depth}"
+            kexpr = self.decode_expr(args[0], key, depth + 1)
+            vexpr = self.decode_expr(args[1], item, depth + 1)
+            if kexpr is None or vexpr is None:
+                return None
+            return f"{{{kexpr}: {vexpr} for {key}, {item} in {var}.items()}}"
+        if (
+            origin in {Union, UnionType}
+            and len(args) == 2
+            and NoneType in args
+        ):
+            # from_dict decodes None as None before trying the other type
+            other = args[0] if args[1] is NoneType else args[1]
+            expr = self.decode_expr(other, var, depth)
+            if expr is None:
+                return None
+            return f"(None if {var} is None else {expr})"
+        return None
+
+    def class_ref(self, cls: type) -> str:
+        return f"_C{self.index[cls]}"
+
+    def emit_classes(self) -> None:
+        modules = sorted({cls.__module__ for cls in self.classes})
+        for i, module in enumerate(modules):
+            self.emit(f"import {module} as _m{i}")
+        self.emit()
+        self.emit('__all__ = ["SIGNATURE", "VALID", "from_dict", "to_dict"]')
+        self.emit()
+        self.emit("_MISSING = object()")
+        self.emit("_ATOMS = frozenset((int, float, str, bool, type(None)))")
+        self.emit()
+        for cls in self.classes:
+            module = modules.index(cls.__module__)
+            self.emit(f"{self.class_ref(cls)} = _m{module}.{cls.__qualname__}")
+        self.emit()
+        self.emit(
+            f"_CLASSES = [{', '.join(map(self.class_ref, self.classes))}]"
+        )
+        self.emit()
+        self.emit(f"SIGNATURE = {class_signature(self.classes)!r}")
+        self.emit("VALID = _class_signature(_CLASSES) == SIGNATURE")
+
+    def emit_decoder(self, cls: type) -> None:
+        i = self.index[cls]
+        ref = self.class_ref(cls)
+        self.emit()
+        self.emit()
+        self.emit(f"def _decode_{i}(data):")
+        if getattr(cls, "__lazy__", False):
+            # lazy classes already defer the work of decoding nested fields
+            self.emit(f"    return _from_dict({ref}, data)")
+            return
+        self.emit("    kwargs = {}")
+        for name, hint in get_dataclass_type_hints(cls).items():
+            expr = self.decode_expr(hint, "v", 0)
+            if expr is None:
+                expr = f"_from_dict(_field_type_hint({ref}, {name!r}), v)"
+            self.emit(f"    v = data.get({name!r}, _MISSING)")
+            self.emit("    if v is not _MISSING:")
+            self.emit(f"        kwargs[{name!r}] = {expr}")
+        self.emit(f"    return {ref}(**kwargs)")
+
+    def emit_encoder(self, cls: type) -> None:
+        i = self.index[cls]
+        self.emit()
+        self.emit()
+        self.emit(f"def _dump_{i}(obj):")
+        if getattr(cls, "__lazy__", False):
+            self.emit("    return _to_dict(obj)")
+            return
+        items = [
+            f"{name!r}: _enc(obj.{name})"
+            for name in get_dataclass_type_hints(cls)
+        ]
+        names = [f.name for f in fields(cls)]
+        items.extend(
+            f"{a!r}: obj.{a}"
+            for a in cls._dispatch_registry.attrs
+            if "." not in a and a not in names
+        )
+        if not items:
+            self.emit("    return {}")
+            return
+        self.emit("    return {")
+        for item in items:
+            self.emit(f"        {item},")
+        self.emit("    }")
+
+    def emit_loader(self, root: type, n: int) -> None:
+        registry = root._dispatch_registry
+        table = {}
+        if registry.attrs:
+            keys: dict[tuple, list[type]] = {}
+            for cls in registry.constraints:
+                key = tuple(_getattr(cls, a) for a in registry.attrs)
+                keys.setdefault(key, []).append(cls)
+            for key, classes in keys.items():
+                cls = classes[0]
+                if (
+                    len(classes) == 1
+                    and cls in self.index
+                    and _is_true(registry.constraints[cls])
+                    and _is_literal(key)
+                ):
+                    table[key] = cls
+        ref = self.class_ref(root) if root in self.index else None
+        self.emit()
+        self.emit()
+        self.emit(f"_R{n} = {ref}._dispatch_registry")
+        if registry.attrs:
+            self.emit(f"_TABLE_{n} = {{")
+            for key, cls in table.items():
+                self.emit(f"    {key!r}: _decode_{self.index[cls]},")
+            self.emit("}")
+        self.emit()
+        self.emit()
+        self.emit(f"def _load_{n}(data):")
+        self.emit(
+            f"    if type(data) is not dict "
+            f"or len(_R{n}.constraints) != {len(registry.constraints)}:"
+        )
+        self.emit(f"        return _from_dict({ref}, data)")
+        if registry.attrs:
+            getters = []
+            for a in registry.attrs:
+                if "." in a:
+                    path = "".join(f"[{p!r}]" for p in a.split("."))
+                    getters.append(f"data{path}")
+                else:
+                    getters.append(f"data.get({a!r})")
+            self.emit("    try:")
+            self.emit(
+                f"        decode = _TABLE_{n}.get(({', '.join(getters)},))"
+            )
+            self.emit("    except (KeyError, TypeError):")
+            self.emit("        decode = None")
+        else:
+            self.emit(f"    decode = _DECODERS.get(_R{n}.resolve_type(data))")
+        self.emit("    if decode is None:")
+        self.emit(f"        return _from_dict({ref}, data)")
+        self.emit("    return decode(data)")
+
+    def render(self, module: str) -> str:
+        self.lines = _HEADER.format(module=module).splitlines()
+        self.emit()
+        self.emit_classes()
+        for cls in self.members:
+            self.emit_decoder(cls)
+        for cls in self.members:
+            self.emit_encoder(cls)
+        for root, n in self.roots.items():
+            if root in self.index:
+                self.emit_loader(root, n)
+        self.emit()
+        self.emit()
+        self.emit("_DECODERS = {")
+        for cls in self.members:
+            self.emit(f"    {self.class_ref(cls)}: _decode_{self.index[cls]},")
+        self.emit("}")
+        self.emit("_LOADERS = {")
+        for cls in self.classes:
+            n = self.roots[_registry_root(cls)]
+            if _registry_root(cls) in self.index:
+                self.emit(f"    {self.class_ref(cls)}: _load_{n},")
+        self.emit("}")
+        self.emit("_DUMPERS = {")
+        for cls in self.members:
+            self.emit(f"    {self.class_ref(cls)}: _dump_{self.index[cls]},")
+        self.emit("}")
+        return "\n".join(self.lines) + _RUNTIME
+
+
+def compile_module(module: str | ModuleType) -> str:
+    """Generate the source of a module with precompiled (de)serializers.
+
+    The generated module exposes ``from_dict(cls, data)`` and
+    ``to_dict(obj)`` functions that behave like their dynamic counterparts
+    for every config class defined in (or reachable from) the module, with
+    straight-line code per class and a static dispatch table per family.
+
+    Parameters
+    ----------
+    module : str or ModuleType
+        The module (or its importable name) that defines the config classes.
+
+    Returns
+    -------
+    str
+        Source code of the generated module.
+
+    Examples
+    --------
+    >>> source = compile_module("myapp.configs")  # doctest: +SKIP
+    """
+    if isinstance(module, str):
+        module = importlib.import_module(module)
+    classes = _collect(module)
+    if not classes:
+        msg = f"no config classes found in module {module.__name__}"
+        raise ValueError(msg)
+    return _Emitter(classes).render(module.__name__)
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import hashlib
+import weakref
+from collections.abc import Mapping
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime, time
+from enum import Enum
+from pathlib import PurePath
+from typing import Any
+
+from nightjar.utils import qualname
+
+__all__ = ["fingerprint", "invalidate_fingerprint"]
+
+DIGEST_SIZE = 16
+
+# keys of the per-instance cache in the instance __dict__
+_CACHE_KEY = "_fingerprint"
+_PARENTS_KEY = "_fingerprint_parents"
+
+
+def _hash(*parts: bytes) -> bytes:
+    h = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    for part in parts:
+        # length prefix keeps the concatenation of parts unambiguous
+        h.update(len(part).to_bytes(4, "little"))
+        h.update(part)
+    return h.digest()
+
+
+def _identity(obj: Any) -> bytes:
+    cls = type(obj)
+    identity = qualname(cls)
+    registry = getattr(cls, "_dispatch_registry", None)
+    if registry is not None:
+        for a in registry.attrs:
+            if "." in a:
+                continue
+            identity += f";{a}={getattr(obj, a, None)!r}"
+    return identity.encode("utf-8")
+
+
+def _without_cache(state: dict[str, Any]) -> dict[str, Any]:
+    # the cache holds weakrefs, which cannot be pickled
+    if _CACHE_KEY not in state and _PARENTS_KEY not in state:
+        return state
+    state = state.copy()
+    state.pop(_CACHE_KEY, None)
+    state.pop(_PARENTS_KEY, None)
+    return state
+
+
+def _link(child: Any, parent: Any) -> None:
+    parents = child.__dict__.setdefault(_PARENTS_KEY, {})
+    parents[id(parent)] = weakref.ref(parent)
+
+
+def _digest(value: Any, parent: Any = None) -> bytes:
+    cls = type(value)
+    if value is None:
+        return b"N"
+    if cls is bool:
+        return b"B" + (b"1" if value else b"0")
+    if cls is int:
+        return b"I" + str(value).encode()
+    if cls is float:
+        return b"F" + repr(value).encode()
+    if cls is str:
+        return _hash(b"S", value.encode("utf-8"))
+    if hasattr(cls, "_dispatch_registry") and is_dataclass(value):
+        if parent is not None:
+            _link(value, parent)
+        digest = value.__dict__.get(_CACHE_KEY)
+        if digest is None:
+            digest = _digest_fields(value, value)
+            value.__dict__[_CACHE_KEY] = digest
+        return digest
+    if is_dataclass(value) and not isinstance(value, type):
+        return _digest_fields(value, parent)
+    if isinstance(value, (list, tuple)):
+        return _hash(b"L", *(_digest(v, parent) for v in value))
+    if isinstance(value, Mapping):
+        items = sorted(
+            _hash(_digest(k, parent), _digest(v, parent))
+            for k, v in value.items()
+        )
+        return _hash(b"M", *items)
+    if isinstance(value, (set, frozenset)):
+        return _hash(b"E", *sorted(_digest(v, parent) for v in value))
+    if isinstance(value, bytes):
+        return _hash(b"Y", value)
+    if isinstance(value, (datetime, date, time)):
+        return _hash(b"T", value.isoformat().encode())
+    if isinstance(value, PurePath):
+        return _hash(b"P", str(value).encode("utf-8"))
+    if isinstance(value, (int, float, str)):
+        # subclasses of the primitive types, such as enums
+        return _hash(b"O", _identity(value), repr(value).encode("utf-8"))
+    if isinstance(value, Enum):
+        return _hash(b"O", _identity(value), value.name.encode("utf-8"))
+    # the default repr of other objects includes their memory address
+    msg = f"cannot fingerprint a value of type {cls.__name__}"
+    raise TypeError(msg)
+
+
+def _digest_fields(obj: Any, parent: Any) -> bytes:
+    items = sorted(
+        _hash(f.name.encode(), _digest(getattr(obj, f.name), parent))
+        for f in fields(obj)
+    )
+    return _hash(b"C", _identity(obj), *items)
+
+
+def fingerprint(obj: Any) -> str:
+    """Compute a stable content fingerprint of a config.
+
+    The fingerprint is independent of the order of fields and mapping keys
+    and includes the class and dispatch attribute values of every config in
+    the tree. Fingerprints of nested configs are cached and reused until an
+    attribute of the config, or of one of its nested configs, is assigned.
+
+    Parameters
+    ----------
+    obj : Any
+        The config (or any value a config field can hold).
+
+    Returns
+    -------
+    str
+        Hex digest of the fingerprint.
+
+    Raises
+    ------
+    TypeError
+        If the config holds a value of a type that has no stable encoding,
+        such as an arbitrary object whose repr includes its address.
+
+    Notes
+    -----
+    In-place changes to list or dict fields, such as ``append``, are not
+    tracked. Call :func:`invalidate_fingerprint` on the owning config after
+    such changes.
+    """
+    return _hash(_digest(obj)).hex()
+
+
+def invalidate_fingerprint(obj: Any) -> None:
+    """Drop the cached fingerprint of a config and of its parents.
+
+    Parameters
+    ----------
+    obj : Any
+        The config whose content has changed.
+    """
+    state = obj.__dict__
+    if _CACHE_KEY not in state and _PARENTS_KEY not in state:
+        return
+    state.pop(_CACHE_KEY, None)
+    parents = state.pop(_PARENTS_KEY, None)
+    if not parents:
+        return
+    for ref in parents.values():
+        parent = ref()
+        if parent is not None:
+            invalidate_fingerprint(parent)
@@ -0,0 +1,462 @@
+from __future__ import annotations
+
+import functools
+import json
+import math
+from collections.abc import Iterator, Mapping
+from dataclasses import MISSING, is_dataclass
+from json.decoder import WHITESPACE, JSONDecodeError, scanstring
+from json.encoder import encode_basestring_ascii
+from typing import (
+    IO,
+    Any,
+    Dict,
+    List,
+    Type,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from nightjar.serializers import (
+    LazyValue,
+    from_dict,
+    is_nested_type,
+    json_default,
+)
+from nightjar.utils import get_dataclass_type_hints
+
+try:
+    from types import UnionType
+except ImportError:
+    from typing import Union as UnionType
+
+__all__ = ["dump_json", "from_json", "iter_json"]
+
+T = TypeVar("T")
+
+NoneType = type(None)
+
+_WHITESPACE_CHARS = frozenset(" \t\n\r")
+
+_scan_once = json.JSONDecoder().scan_once
+
+_encode = json.JSONEncoder(default=json_default).encode
+
+_ATOMS = frozenset((str, int, float, bool, type(None)))
+
+# number of items of a list of atoms encoded at once
+_SLICE_SIZE = 1024
+
+CHUNK_SIZE = 1 << 16
+
+
+def _config_classes(hint: Any) -> tuple[type, ...]:
+    # config classes that appear in a type hint
+    try:
+        return _cached_config_classes(hint)
+    except TypeError:
+        # unhashable hint
+        return _find_config_classes(hint)
+
+
+def _find_config_classes(hint: Any) -> tuple[type, ...]:
+    if hasattr(hint, "_dispatch_registry"):
+        return (hint,)
+    classes: tuple[type, ...] = ()
+    for arg in get_args(hint):
+        classes += _config_classes(arg)
+    return classes
+
+
+_cached_config_classes = functools.lru_cache(maxsize=None)(
+    _find_config_classes
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _member_hints(registry: Any, n_classes: int) -> dict[str, Any]:
+    # members of a family that are decoded before the class is resolved --
+    # those whose hint contains configs, is the same in every class of the
+    # family and does not decide the class (n_classes keys the cache)
+    names = registry.discriminators
+    classes = list(registry.constraints)
+    if names is None or any(getattr(c, "__lazy__", False) for c in classes):
+        return {}
+    hints: dict[str, Any] = {}
+    conflicts = set()
+    for cls in classes:
+        for name, hint in get_dataclass_type_hints(cls).items():
+            if name in names or not _config_classes(hint):
+                continue
+            if hints.setdefault(name, hint) != hint:
+                conflicts.add(name)
+    for name in conflicts:
+        del hints[name]
+    return hints
+
+
+def _family_hints(cls: type) -> dict[str, Any]:
+    registry = cls._dispatch_registry
+    return _member_hints(registry, len(registry.constraints))
+
+
+def _structured(hint: Any) -> bool:
+    # whether a value is decoded member by member, otherwise it is scanned
+    # at once and converted with from_dict
+    return any(_family_hints(cls) for cls in _config_classes(hint))
+
+
+class _Reader:
+    def __init__(self, s: str) -> None:
+        self.s = s
+
+    def ws(self, i: int) -> int:
+        if self.s[i : i + 1] not in _WHITESPACE_CHARS:
+            return i
+        return WHITESPACE.match(self.s, i).end()
+
+    def expect(self, i: int, char: str) -> int:
+        i = self.ws(i)
+        if self.s[i : i + 1] != char:
+            msg = f"Expecting '{char}'"
+            raise JSONDecodeError(msg, self.s, i)
+        return i + 1
+
+    def raw(self, i: int) -> tuple[Any, int]:
+        i = self.ws(i)
+        try:
+            return _scan_once(self.s, i)
+        except StopIteration as e:
+            msg = "Expecting value"
+            raise JSONDecodeError(msg, self.s, e.value) from None
+
+    def members(self, i: int) -> Iterator[tuple[str, int]]:
+        """Yield the key and value position of each member of an object.
+
+        The caller has to advance ``self.end`` past each value.
+        """
+        s = self.s
+        i = self.expect(i, "{")
+        i = self.ws(i)
+        if s[i : i + 1] == "}":
+            self.end = i + 1
+            return
+        while True:
+            if s[i : i + 1] != '"':
+                msg = "Expecting property name enclosed in double quotes"
+                raise JSONDecodeError(msg, s, i)
+            key, i = scanstring(s, i + 1)
+            i = self.ws(self.expect(i, ":"))
+            yield key, i
+            i = self.ws(self.end)
+            if s[i : i + 1] == "}":
+                self.end = i + 1
+                return
+            i = self.ws(self.expect(i, ","))
+
+    def items(self, i: int) -> Iterator[int]:
+        """Yield the position of each item of an array.
+
+        The caller has to advance ``self.end`` past each item.
+        """
+        s = self.s
+        i = self.ws(self.expect(i, "["))
+        if s[i : i + 1] == "]":
+            self.end = i + 1
+            return
+        while True:
+            yield i
+            i = self.ws(self.end)
+            if s[i : i + 1] == "]":
+                self.end = i + 1
+                return
+            i = self.ws(self.expect(i, ","))
+
+    def decode(self, typ: Any, i: int) -> tuple[Any, int]:
+        i = self.ws(i)
+        if not _structured(typ):
+            value, end = self.raw(i)
+            if typ is Any:
+                return value, end
+            return from_dict(typ, value), end
+        origin, args = get_origin(typ), get_args(typ)
+        char = self.s[i : i + 1]
+        if origin is Union or origin is UnionType:
+            if NoneType in args and self.s.startswith("null", i):
+                return None, i + 4
+            others = [t for t in args if t is not NoneType]
+            if len(others) == 1:
+                try:
+                    return self.decode(others[0], i)
+                except JSONDecodeError:
+                    raise
+                except (ValueError, TypeError):
+                    # the error of from_dict, which tries every type
+                    msg = f"could not convert to any type in Union: {origin}"
+                    raise ValueError(msg) from None
+        elif hasattr(typ, "_dispatch_registry") and char == "{":
+            return self.decode_config(typ, i)
+        elif origin in {list, List} and len(args) == 1 and char == "[":
+            values = []
+            for start in self.items(i):
+                value, self.end = self.decode(args[0], start)
+                values.append(value)
+            return values, self.end
+        elif (
+            origin in {dict, Dict, Mapping} and len(args) == 2 and char == "{"
+        ):
+            ktype, vtype = args
+            values = {}
+            for key, start in self.members(i):
+                value, self.end = self.decode(vtype, start)
+                values[from_dict(ktype, key)] = value
+            return values, self.end
+        value, end = self.raw(i)
+        return from_dict(typ, value), end
+
+    def decode_config(self, typ: type, i: int) -> tuple[Any, int]:
+        hints = _family_hints(typ)
+        values = {}
+        decoded = set()
+        for key, start in self.members(i):
+            hint = hints.get(key)
+            if hint is None:
+                values[key], self.end = self.raw(start)
+            else:
+                values[key], self.end = self.decode(hint, start)
+                decoded.add(key)
+        end = self.end
+        klass = typ._dispatch_registry.resolve_type(values)
+        field_types = get_dataclass_type_hints(klass)
+        lazy = getattr(klass, "__lazy__", False)
+        kwargs = {}
+        for key, value in values.items():
+            if key not in field_types:
+                continue
+            hint = field_types[key]
+            if key in decoded:
+                kwargs[key] = value
+            elif lazy and is_nested_type(hint):
+                kwargs[key] = LazyValue(hint, value)
+            else:
+                kwargs[key] = from_dict(hint, value)
+        return klass(**kwargs), end
+
+
+def from_json(cls: Type[T], data: str | bytes | bytearray | IO) -> T:
+    """Decode a JSON document directly into a config.
+
+    Configs whose fields hold other configs are built while the document
+    is parsed, so the intermediate dict tree of those levels is never
+    materialized. Every value is scanned once, and subtrees without such
+    configs are parsed by the scanner of :mod:`json` and converted with the
+    type of their field.
+
+    Parameters
+    ----------
+    cls : type
+        The config class (usually the root of a dispatch family).
+    data : str, bytes, bytearray or file
+        The JSON document, or a file object to read it from.
+
+    Returns
+    -------
+    BaseConfig
+        The decoded config.
+
+    Raises
+    ------
+    json.JSONDecodeError
+        If the document is not valid JSON.
+
+    Examples
+    --------
+    >>> with open("config.json", "rb") as f:  # doctest: +SKIP
+    ...     config = from_json(VehicleConfig, f)
+    """
+    if hasattr(data, "read"):
+        data = data.read()
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode(json.detect_encoding(data), "surrogatepass")
+    if data.startswith("\ufeff"):
+        msg = "Unexpected UTF-8 BOM (decode using utf-8-sig)"
+        raise JSONDecodeError(msg, data, 0)
+    reader = _Reader(data)
+    value, end = reader.decode(cls, 0)
+    end = reader.ws(end)
+    if end != len(data):
+        msg = "Extra data"
+        raise JSONDecodeError(msg, data, end)
+    return value
+
+
+def _float(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if value == float("inf"):
+        return "Infinity"
+    if value == -float("inf"):
+        return "-Infinity"
+    # like json.dumps, subclasses are written as plain floats
+    return float.__repr__(value)  # noqa: PLC2801
+
+
+def _key(key: Any) -> str:
+    # the conversions of json.dumps for keys that are not strings
+    if isinstance(key, str):
+        return key
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, float):
+        return _float(key)
+    if isinstance(key, int):
+        # like json.dumps, IntEnum and other subclasses are written as ints
+        return int.__repr__(key)  # noqa: PLC2801
+    msg = (
+        f"keys must be str, int, float, bool or None, not {type(key).__name__}"
+    )
+    raise TypeError(msg)
+
+
+def _members(obj: Any, dispatch: bool) -> Iterator[tuple[str, Any]]:
+    # the items of to_dict, for a config following DispatchRegistry.dump
+    cls = type(obj)
+    names = get_dataclass_type_hints(cls)
+    lazy = getattr(obj, "__lazy__", False)
+    for name in names:
+        value = obj.__dict__.get(name, MISSING) if lazy else MISSING
+        if isinstance(value, LazyValue) and not value.resolved:
+            # the raw subtree is written without decoding it
+            yield name, value.raw
+        else:
+            yield name, getattr(obj, name)
+    if not dispatch:
+        return
+    for a in cls._dispatch_registry.attrs:
+        if "." in a or a in names:
+            continue
+        value = getattr(obj, a, MISSING)
+        if value is not MISSING:
+            yield a, value
+
+
+def _iter_object(items: Iterator[tuple[Any, Any]]) -> Iterator[str]:
+    yield "{"
+    separator = ""
+    for key, value in items:
+        yield f"{separator}{encode_basestring_ascii(_key(key))}: "
+        yield from _iter_value(value)
+        separator = ", "
+    yield "}"
+
+
+def _iter_array(values: list | tuple) -> Iterator[str]:
+    yield "["
+    if all(type(v) in _ATOMS for v in values):
+        # encode slices of atoms at once, without the brackets
+        for i in range(0, len(values), _SLICE_SIZE):
+            chunk = _encode(values[i : i + _SLICE_SIZE])[1:-1]
+            yield chunk if i == 0 else ", " + chunk
+    else:
+        separator = ""
+        for value in values:
+            yield separator
+            yield from _iter_value(value)
+            separator = ", "
+    yield "]"
+
+
+def _iter_value(value: Any) -> Iterator[str]:
+    cls = type(value)
+    if cls is str:
+        yield encode_basestring_ascii(value)
+    elif value is None:
+        yield "null"
+    elif value is True:
+        yield "true"
+    elif value is False:
+        yield "false"
+    elif cls is int:
+        yield repr(value)
+    elif cls is float:
+        yield _float(value)
+    elif hasattr(cls, "_dispatch_registry"):
+        yield from _iter_object(_members(value, dispatch=True))
+    elif is_dataclass(value) and not isinstance(value, type):
+        yield from _iter_object(_members(value, dispatch=False))
+    elif isinstance(value, (list, tuple)):
+        yield from _iter_array(value)
+    elif isinstance(value, Mapping):
+        yield from _iter_object(iter(value.items()))
+    else:
+        yield _encode(value)
+
+
+def iter_json(obj: Any, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Encode a config as JSON text incrementally.
+
+    The output is the same as ``json.dumps(to_dict(obj),
+    default=json_default)``, but the config tree is walked as the text is
+    produced, so the intermediate dict tree and the complete string are
+    never built. Memory use grows with the depth of the tree rather than
+    its size.
+
+    Parameters
+    ----------
+    obj : Any
+        The config (or any value a config field can hold).
+    chunk_size : int, default=65536
+        Approximate number of characters per yielded chunk.
+
+    Yields
+    ------
+    str
+        Consecutive chunks of the JSON text.
+
+    Raises
+    ------
+    TypeError
+        If a value is not JSON serializable.
+    """
+    buffer: list[str] = []
+    size = 0
+    for part in _iter_value(obj):
+        buffer.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def dump_json(obj: Any, fp: IO[str], chunk_size: int = CHUNK_SIZE) -> None:
+    """Write a config as JSON text to a file object incrementally.
+
+    Parameters
+    ----------
+    obj : Any
+        The config (or any value a config field can hold).
+    fp : file
+        Text file object to write to.
+    chunk_size : int, default=65536
+        Approximate number of characters per write.
+
+    See Also
+    --------
+    iter_json
+
+    Examples
+    --------
+    >>> with open("config.json", "w") as f:  # doctest: +SKIP
+    ...     dump_json(config, f)
+    """
+    for chunk in iter_json(obj, chunk_size=chunk_size):
+        fp.write(chunk)
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import abc
+import dataclasses
+import functools
+from collections.abc import Mapping
+from dataclasses import fields, is_dataclass
+from typing import Any, TypeVar
+
+from nightjar.serializers import from_dict
+from nightjar.utils import get_dataclass_type_hints, redispatch, split_paths
+
+__all__ = ["overlay"]
+
+T = TypeVar("T")
+
+# keys of the overlay state in the instance __dict__
+_BASE_KEY = "_overlay_base"
+_VALUES_KEY = "_overlay_values"
+
+
+class _OverlayField:
+    """Data descriptor that reads a field from the overrides, then the base."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            # mimic the class attribute of the config class
+            return getattr(owner.__overlay_of__, self.name)
+        state = instance.__dict__
+        values = state[_VALUES_KEY]
+        if self.name in values:
+            return values[self.name]
+        return getattr(state[_BASE_KEY], self.name)
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        # assignments never reach the base config
+        instance.__dict__[_VALUES_KEY][self.name] = value
+
+
+def _restore(cls: type, base: Any, values: dict[str, Any]) -> Any:
+    view = object.__new__(_overlay_class(cls))
+    view.__dict__.update({_BASE_KEY: base, _VALUES_KEY: values})
+    return view
+
+
+def _reduce(self: Any) -> tuple:
+    state = self.__dict__
+    return (
+        _restore,
+        (self.__overlay_of__, state[_BASE_KEY], dict(state[_VALUES_KEY])),
+    )
+
+
+def _eq(self: Any, other: Any) -> bool:
+    # views compare equal to configs of the same class with the same fields
+    cls = self.__overlay_of__
+    if getattr(type(other), "__overlay_of__", type(other)) is not cls:
+        return NotImplemented
+    names = [f.name for f in fields(cls) if f.compare]
+    return tuple(getattr(self, n) for n in names) == tuple(
+        getattr(other, n) for n in names
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _overlay_class(cls: type) -> type:
+    namespace: dict[str, Any] = {
+        f.name: _OverlayField(f.name) for f in fields(cls)
+    }
+    namespace.update(
+        __module__=cls.__module__,
+        __qualname__=cls.__qualname__,
+        __overlay_of__=cls,
+        __reduce__=_reduce,
+        # calls __reduce__ instead of the compact pickling of the class
+        __reduce_ex__=object.__reduce_ex__,
+        __eq__=_eq,
+        __hash__=None,
+    )
+    # ABCMeta.__new__ skips the dataclass decoration and the dispatch
+    # registration of AttributeMapMeta
+    return abc.ABCMeta.__new__(type(cls), cls.__name__, (cls,), namespace)
+
+
+def _decode(klass: type, name: str, value: Any) -> Any:
+    hints = get_dataclass_type_hints(klass)
+    if name not in hints:
+        msg = f"{klass.__name__} has no field named {name}"
+        raise ValueError(msg)
+    if is_dataclass(value) and not isinstance(value, type):
+        return value
+    return from_dict(hints[name], value)
+
+
+def _override(obj: Any, overrides: Mapping[str, Any]) -> Any:
+    if hasattr(type(obj), "_dispatch_registry"):
+        return overlay(obj, overrides)
+    if is_dataclass(obj) and not isinstance(obj, type):
+        # plain dataclasses are copied, their fields are still shared
+        direct, nested = split_paths(overrides)
+        changes = {
+            name: _decode(type(obj), name, value)
+            for name, value in direct.items()
+        }
+        for name, sub in nested.items():
+            current = changes.get(name, getattr(obj, name))
+            changes[name] = _override(current, sub)
+        return dataclasses.replace(obj, **changes)
+    msg = f"cannot override fields of a {type(obj).__name__} value"
+    raise ValueError(msg)
+
+
+def overlay(base: T, overrides: Mapping[str, Any]) -> T:
+    """Return a view of a config with some fields overridden.
+
+    The view is an instance of (a subclass of) the class of the base config,
+    so it can be used wherever the config is expected, but fields that are
+    not overridden are read from the base config instead of being copied.
+    Override values are decoded with the type hint of their field, and
+    assignments to the view only change the view. Overlaying a view adds
+    its overrides to the same layer over the original base config.
+
+    Parameters
+    ----------
+    base : BaseConfig
+        The config to overlay, which may itself be an overlay.
+    overrides : Mapping of str to Any
+        Override values keyed by the dotted path of the field. Overriding a
+        discriminator of a dispatch family re-resolves the class, in which
+        case the result is a new config of the resolved class that shares
+        the field values of the base config.
+
+    Returns
+    -------
+    BaseConfig
+        The overlaid config.
+
+    Raises
+    ------
+    ValueError
+        If an overridden field does not exist.
+
+    Notes
+    -----
+    The view reads the base config on every access, so the base config
+    should not be modified in place while views of it are in use.
+
+    Examples
+    --------
+    >>> config = overlay(base, {"batch_size": 64, "optimizer.lr": 0.01})  # doctest: +SKIP
+    >>> module = AutoModule(config)  # doctest: +SKIP
+    """
+    klass = getattr(type(base), "__overlay_of__", type(base))
+    direct, nested = split_paths(overrides)
+    registry = klass._dispatch_registry
+    names = registry.discriminators
+    if direct and (names is None or not names.isdisjoint(direct)):
+        new = redispatch(
+            base,
+            klass,
+            direct,
+            lambda new_klass, name: _decode(new_klass, name, direct[name]),
+        )
+        if new is not None:
+            for name, sub in nested.items():
+                setattr(new, name, _override(getattr(new, name), sub))
+            return new
+    values: dict[str, Any] = {}
+    if klass is not type(base):
+        # flatten the layers of overlays of overlays
+        values.update(base.__dict__[_VALUES_KEY])
+        base = base.__dict__[_BASE_KEY]
+    field_names = {f.name for f in fields(klass)}
+    for name, value in direct.items():
+        if name not in field_names and name in registry.attrs:
+            # the class did not change, so the value is already in effect
+            continue
+        values[name] = _decode(klass, name, value)
+    for name, sub in nested.items():
+        current = values[name] if name in values else getattr(base, name)
+        values[name] = _override(current, sub)
+    return _restore(klass, base, values)
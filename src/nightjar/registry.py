@@ -1,27 +1,48 @@
 from __future__ import annotations
 
 import functools
+import importlib
+import itertools
 import operator
+import threading
 from collections import defaultdict
-from collections.abc import Callable
+from collections.abc import Callable, Iterator, Mapping, Sequence
 from dataclasses import MISSING
 from typing import Any, Generic, Type, TypeVar
 
-from nightjar.serializers import from_dict, to_dict
-from nightjar.utils import get_dataclass_type_hints
+from nightjar.serializers import decode_field, to_dict
+from nightjar.utils import get_dataclass_type_hints, get_entry_points
 
 F = Callable[..., Any]
 T = TypeVar("T")
+Batch = Mapping[str, Sequence[Any]]
+
+_SCALARS = (str, bytes, int, float, bool, type(None))
+_INVALID = object()
 
 
 def _getattr(cls: type, attr: str):
-    if "." not in attr:
-        return getattr(cls, attr)
+    # MISSING when the class leaves the attribute unset (matches any value)
     parts = attr.split(".")
     for part in parts[:-1]:
-        cls = get_dataclass_type_hints(cls)[part]
-    part = parts[-1]
-    return getattr(cls, part, None)
+        cls = get_dataclass_type_hints(cls).get(part, MISSING)
+        if cls is MISSING:
+            return MISSING
+    return getattr(cls, parts[-1], MISSING)
+
+
+def _accessor(key: str) -> Callable[[Mapping], Any]:
+    # precompiled equivalent of _getitem for a single key
+    if "." not in key:
+        return operator.methodcaller("get", key)
+    parts = key.split(".")
+
+    def get(obj: Mapping) -> Any:
+        for part in parts:
+            obj = obj[part]
+        return obj
+
+    return get
 
 
 def _getitem(obj: dict, key: str) -> Any:
@@ -37,12 +58,109 @@ def _getitem(obj: dict, key: str) -> Any:
         raise KeyError(msg) from None
 
 
+@functools.lru_cache(maxsize=None)
+def _numpy() -> Any:
+    try:
+        # imported lazily to keep numpy out of the import time of nightjar
+        import numpy as np  # noqa: PLC0415
+    except ImportError:
+        return None
+    return np
+
+
+def _to_array(values: Sequence[Any]) -> Any:
+    np = _numpy()
+    if np is None:
+        return values if isinstance(values, list) else list(values)
+    if isinstance(values, np.ndarray) and values.dtype == object:
+        return values
+    # fill an object array to keep nested values from adding dimensions
+    array = np.empty(len(values), dtype=object)
+    array[:] = list(values)
+    return array
+
+
+def _to_mask(column: Sequence[Any]) -> Any:
+    np = _numpy()
+    if np is None:
+        return [bool(v) for v in column]
+    return np.asarray(column).astype(bool)
+
+
+def _batch_size(batch: Batch, size: int | None = None) -> int:
+    sizes = {len(column) for column in batch.values()}
+    if size is not None:
+        sizes.add(size)
+    if len(sizes) > 1:
+        msg = "all columns of a batch must have the same length"
+        raise ValueError(msg)
+    return sizes.pop() if sizes else 0
+
+
+def _row(batch: Batch, index: int) -> dict:
+    return {
+        k: column[index]
+        for k, column in batch.items()
+        if column[index] is not MISSING
+    }
+
+
+def to_columns(records: Sequence[Mapping[str, Any]]) -> dict[str, list]:
+    """Convert records to a column-oriented batch.
+
+    Parameters
+    ----------
+    records : Sequence of Mapping
+        The records (rows) of the batch.
+
+    Returns
+    -------
+    dict of str to list
+        One column per key, where records without the key hold
+        ``dataclasses.MISSING``.
+    """
+    columns: dict[str, list] = {}
+    for i, record in enumerate(records):
+        for k, v in record.items():
+            if k not in columns:
+                columns[k] = [MISSING] * len(records)
+            columns[k][i] = v
+    return columns
+
+
 class Expression:
     __hash__ = None
 
     def evaluate(self, val: dict) -> bool:
         raise NotImplementedError
 
+    def evaluate_batch(self, batch: Batch, size: int) -> Sequence[Any]:
+        """Evaluate the expression for every row of a column-oriented batch.
+
+        Parameters
+        ----------
+        batch : Mapping of str to Sequence
+            Columns of the batch, missing values are ``dataclasses.MISSING``.
+        size : int
+            Number of rows in the batch.
+
+        Returns
+        -------
+        Sequence
+            One result per row, as a NumPy array when NumPy is available.
+        """
+        return _to_array([self.evaluate(_row(batch, i)) for i in range(size)])
+
+    def field_names(self) -> set[str] | None:  # noqa: PLR6301 (overridden)
+        """Return the names of the fields the expression depends on.
+
+        Returns
+        -------
+        set of str or None
+            The field names, or None if they cannot be determined.
+        """
+        return None
+
     def __and__(self, other: Expression) -> Expression:
         return FunctionExpression(operator.and_, self, other)
 
@@ -91,11 +209,23 @@ class Field(Expression):
     def exists(self) -> Expression:
         return FieldExistsExpression(self.name)
 
+    def field_names(self) -> set[str] | None:
+        return {self.name}
+
     def evaluate(self, val: dict) -> Any:
         if self.default is MISSING:
             return val[self.name]
         return val.get(self.name, self.default)
 
+    def evaluate_batch(self, batch: Batch, size: int) -> Sequence[Any]:
+        column = batch.get(self.name)
+        if column is None:
+            return _to_array([self.default] * size)
+        if self.default is MISSING:
+            return _to_array(column)
+        default = self.default
+        return _to_array([default if v is MISSING else v for v in column])
+
     @property
     def str(self) -> StringField:
         return StringField(self.name, self.default)
@@ -131,6 +261,12 @@ class StringField(Field):
             return result
         return str(result)
 
+    def evaluate_batch(self, batch: Batch, size: int) -> Sequence[Any]:
+        column = super().evaluate_batch(batch, size)
+        return _to_array([
+            v if v is None or v is MISSING else str(v) for v in column
+        ])
+
 
 class FieldExistsExpression(Expression):
     field: str
@@ -141,6 +277,15 @@ class FieldExistsExpression(Expression):
     def evaluate(self, val: dict) -> bool:
         return self.field in val
 
+    def field_names(self) -> set[str] | None:
+        return {self.field}
+
+    def evaluate_batch(self, batch: Batch, size: int) -> Sequence[Any]:
+        column = batch.get(self.field)
+        if column is None:
+            return _to_array([False] * size)
+        return _to_array([v is not MISSING for v in column])
+
 
 class FunctionExpression(Expression):
     operator: F
@@ -156,11 +301,64 @@ class FunctionExpression(Expression):
             if isinstance(operand, Expression):
                 operand = operand.evaluate(val)
             operands.append(operand)
+        return self._apply(*operands)
+
+    def field_names(self) -> set[str] | None:
+        names: set[str] = set()
+        for operand in self.operands:
+            if not isinstance(operand, Expression):
+                continue
+            operand_names = operand.field_names()
+            if operand_names is None:
+                return None
+            names.update(operand_names)
+        return names
+
+    def _apply(self, *operands: Any) -> Any:
         try:
             return self.operator(*operands)
         except Exception:
             return False
 
+    def evaluate_batch(self, batch: Batch, size: int) -> Sequence[Any]:
+        columns = []
+        for operand in self.operands:
+            if isinstance(operand, Expression):
+                columns.append(operand.evaluate_batch(batch, size))
+            else:
+                columns.append(None)
+        result = self._evaluate_vectorized(columns)
+        if result is not None:
+            return result
+        operands = [
+            itertools.repeat(operand) if column is None else column
+            for operand, column in zip(self.operands, columns)
+        ]
+        return _to_array([self._apply(*row) for row in zip(*operands)])
+
+    def _evaluate_vectorized(self, columns: list) -> Any:
+        np = _numpy()
+        if np is None:
+            return None
+        ufunc = _vectorized_operators().get(self.operator)
+        if ufunc is None:
+            return None
+        operands = []
+        for operand, column in zip(self.operands, columns):
+            if column is not None:
+                operand = _to_array(column)
+            elif not isinstance(operand, _SCALARS):
+                return None
+            operands.append(operand)
+        try:
+            result = ufunc(*operands)
+        except Exception:
+            # some rows fail -- evaluate them one by one
+            return None
+        if not isinstance(result, np.ndarray) or result.ndim != 1:
+            return None
+        return result.astype(object)
+
 
 class LiteralExpression(Expression):
     value: Any
@@ -171,6 +369,28 @@ class LiteralExpression(Expression):
     def evaluate(self, val: dict) -> bool:
         return bool(self.value)
 
+    def field_names(self) -> set[str] | None:  # noqa: PLR6301 (override)
+        return set()
+
+    def evaluate_batch(self, batch: Batch, size: int) -> Sequence[Any]:
+        return _to_array([bool(self.value)] * size)
+
+
+@functools.lru_cache(maxsize=None)
+def _vectorized_operators() -> dict[F, F]:
+    np = _numpy()
+    return {
+        operator.eq: operator.eq,
+        operator.ne: operator.ne,
+        operator.gt: operator.gt,
+        operator.ge: operator.ge,
+        operator.lt: operator.lt,
+        operator.le: operator.le,
+        operator.and_: operator.and_,
+        operator.or_: operator.or_,
+        operator.not_: np.logical_not,
+    }
+
 
 def create_expression(constraint: Expression | Any) -> Expression:
     if constraint is MISSING:
@@ -180,13 +400,50 @@ def create_expression(constraint: Expression | Any) -> Expression:
     return LiteralExpression(constraint)
 
 
+def _is_true(constraint: Expression) -> bool:
+    return (
+        isinstance(constraint, LiteralExpression) and constraint.value is True
+    )
+
+
+def provider_key(values: tuple | Any) -> str:
+    if not isinstance(values, tuple):
+        values = (values,)
+    return ",".join(str(v) for v in values)
+
+
 class DispatchRegistry(Generic[T]):
-    def __init__(self, attrs: list[str] | str | None = None):
+    def __init__(
+        self,
+        attrs: list[str] | str | None = None,
+        plugins: str | Mapping[Any, str] | None = None,
+    ):
         self.attrs = attrs
         self.constraints: dict[Type, Expression] = {}
+        # tuple of dispatch attribute values (MISSING for unset) -> classes
+        self.index: dict[tuple, set[Type]] = {}
+        # wildcard positions of the keys in the index -> number of keys
+        self._patterns: dict[tuple[bool, ...], int] = {}
+        # wildcard patterns to try after the exact key, grouped by the
+        # number of wildcards so that equally specific keys are ambiguous
+        self._fallbacks: list[list[tuple[bool, ...]]] = []
+        # classes whose constraint always holds
+        self._trivial: set[Type] = set()
+        # attribute -> value -> classes, no longer used for resolution (see
+        # index) but still filled for code that reads it
         self.column_value_types: dict[str, dict[Any, set[Type]]] = defaultdict(
             functools.partial(defaultdict, set)
         )
+        # discriminator key -> module providing the matching class
+        self.providers: dict[str, str] = {}
+        self.plugin_groups: list[str] = []
+        # serializes reading the entry points of the plugin groups
+        self._plugin_lock = threading.Lock()
+        if isinstance(plugins, str):
+            self.plugin_groups.append(plugins)
+        elif plugins is not None:
+            for value, module in plugins.items():
+                self.add_provider(value, module)
 
     @property
     def attrs(self) -> list[str]:
@@ -199,23 +456,141 @@ class DispatchRegistry(Generic[T]):
         elif isinstance(value, str):
             value = [value]
         self._attrs = list(value)
+        self._discriminators: set[str] | None | Any = MISSING
+        # precompiled builder of the index key of the data
+        names = tuple(self._attrs)
+        accessors = [_accessor(a) for a in names]
+        if len(accessors) == 1:
+            (get,) = accessors
+            self._key = lambda val: (get(val),)
+        elif not any("." in a for a in names):
+            self._key = lambda val: tuple(map(val.get, names))
+        else:
+            self._key = lambda val: tuple(get(val) for get in accessors)
+
+    @property
+    def discriminators(self) -> set[str] | None:
+        """Names of the top-level keys that decide the resolved class.
+
+        Returns
+        -------
+        set of str or None
+            The dispatch attributes and the fields referenced by the
+            constraints, or None if a constraint does not report its fields.
+            The set is cached until a class is registered and should not be
+            modified.
+        """
+        if self._discriminators is not MISSING:
+            return self._discriminators
+        names: set[str] | None = {a.partition(".")[0] for a in self.attrs}
+        for constraint in self.constraints.values():
+            constraint_names = constraint.field_names()
+            if constraint_names is None:
+                names = None
+                break
+            names.update(constraint_names)
+        self._discriminators = names
+        return names
 
     def register(self, cls, constraint: Expression | Any = MISSING) -> None:
         # get class attribute values for dispatch attributes
-        for a in self.attrs:
-            val = _getattr(cls, a)
-            self.column_value_types[a][val].add(cls)
+        key = tuple(_getattr(cls, a) for a in self.attrs)
+        for a, val in zip(self.attrs, key):
+            if val is not MISSING:
+                self.column_value_types[a][val].add(cls)
+        if self.attrs:
+            if key not in self.index:
+                pattern = tuple(val is MISSING for val in key)
+                self._patterns[pattern] = self._patterns.get(pattern, 0) + 1
+                groups: dict[int, list[tuple[bool, ...]]] = {}
+                for p in self._patterns:
+                    if any(p):
+                        groups.setdefault(sum(p), []).append(p)
+                self._fallbacks = [groups[n] for n in sorted(groups)]
+            self.index.setdefault(key, set()).add(cls)
         # if there is any additional constraints, keep track of them
         if hasattr(cls, "__match__") and constraint is MISSING:
             constraint = getattr(cls, "__match__", None)
         self.constraints[cls] = create_expression(constraint)
+        if _is_true(self.constraints[cls]):
+            self._trivial.add(cls)
+        else:
+            self._trivial.discard(cls)
+        self._discriminators = MISSING
+
+    def add_provider(self, value: tuple | Any, module: str) -> None:
+        """Declare the module that provides the class for a discriminator.
+
+        The module is imported on demand the first time a matching
+        discriminator value is resolved.
+
+        Parameters
+        ----------
+        value : tuple or Any
+            Value of the dispatch attribute, or a tuple of values when
+            dispatching on multiple attributes. Ignored for constraint
+            based families, where providers are imported when no
+            registered class matches.
+        module : str
+            Importable name of the module defining the class.
+        """
+        self.providers[provider_key(value)] = module
+
+    def load_plugin_groups(self) -> None:
+        """Read the providers declared by the entry point groups.
+
+        The entry points are read once, the modules they name are only
+        imported when a matching discriminator value is resolved.
+        """
+        if not self.plugin_groups:
+            return
+        with self._plugin_lock:
+            while self.plugin_groups:
+                group = self.plugin_groups[0]
+                for name, module in get_entry_points(group).items():
+                    self.providers.setdefault(name, module)
+                # removed only once its providers are added, so that no
+                # thread finds the group gone before its providers are
+                self.plugin_groups.pop(0)
+
+    def import_providers(self, val: dict) -> bool:
+        """Import the modules that may provide a class for the data.
+
+        Parameters
+        ----------
+        val : dict
+            The data that could not be resolved to a registered class.
+
+        Returns
+        -------
+        bool
+            Whether any module was imported.
+        """
+        self.load_plugin_groups()
+        if not self.providers:
+            return False
+        if self.attrs:
+            try:
+                key = provider_key(self._key(val))
+            except (KeyError, TypeError):
+                return False
+            keys = [key] if key in self.providers else []
+        else:
+            keys = list(self.providers)
+        for key in keys:
+            importlib.import_module(self.providers[key])
+            # removed only once imported, so failed imports are retried
+            self.providers.pop(key, None)
+        return bool(keys)
 
     def load(self, val: dict, globalns: Any = None, localns: Any = None) -> T:
-        val = dict(val).copy()
+        if not isinstance(val, dict):
+            val = dict(val)
         klass = self.resolve_type(val)
         field_types = get_dataclass_type_hints(klass)
         kwargs = {
-            k: from_dict(
+            k: decode_field(
+                klass,
                 field_types.get(k, Any),
                 v,
                 globalns=globalns,
@@ -227,30 +602,20 @@ class DispatchRegistry(Generic[T]):
         return klass(**kwargs)
 
     def resolve_type(self, val: dict) -> Any:
-        candidates: set[Type] | None = None
-        for a in self.attrs:
-            attr_val = _getitem(val, a)
-            classes_for_value = self.column_value_types[a].get(attr_val, set())
-            if candidates is None:
-                candidates = set().union(classes_for_value)
-            else:
-                candidates = candidates.intersection(classes_for_value)
-            if not candidates:
-                break
-        if candidates is None:
-            candidates = set()
-            for klass, constraint in self.constraints.items():
-                if not constraint.evaluate(val):
-                    continue
-                candidates.add(klass)
-        else:
-            for klass in list(candidates):
-                if klass not in self.constraints:
-                    continue  # no constraint -- keep it
-                constraint = self.constraints[klass]
-                if constraint.evaluate(val):
-                    continue  # matches constraint -- keep it
-                candidates.discard(klass)
+        if self.attrs and len(self._patterns) == 1:
+            # fast path -- no wildcards, one lookup of the exact key
+            classes = self.index.get(self._key(val))
+            if classes is not None and len(classes) == 1:
+                (klass,) = classes
+                if klass in self._trivial:
+                    return klass
+        n_classes = len(self.constraints)
+        candidates = self._match(val)
+        if not candidates and (
+            # another thread may have imported the provider meanwhile
+            self.import_providers(val) or len(self.constraints) != n_classes
+        ):
+            candidates = self._match(val)
         n_candidates = len(candidates)
         if n_candidates > 1:
             matching_class_names = ", ".join([c.__name__ for c in candidates])
@@ -262,11 +627,179 @@ class DispatchRegistry(Generic[T]):
             raise ValueError(msg)
         return candidates.pop()
 
+    def resolve_types(
+        self, batch: Batch | Sequence[Mapping], size: int | None = None
+    ) -> list[Type]:
+        """Resolve the class of every row of a batch in one pass.
+
+        The constraints of the classes are evaluated over whole columns,
+        using NumPy when it is available. Rows that do not resolve to exactly
+        one class go through :meth:`resolve_type`, which raises the same
+        errors as for a single record.
+
+        Parameters
+        ----------
+        batch : Mapping of str to Sequence, or Sequence of Mapping
+            Column-oriented batch (see :func:`to_columns`) or records.
+        size : int, optional
+            Number of rows of a column-oriented batch, required when the
+            batch has no columns. Defaults to the length of the columns.
+
+        Returns
+        -------
+        list of type
+            The resolved class of every row.
+        """
+        if not isinstance(batch, Mapping):
+            size = len(batch)
+            batch = to_columns(batch)
+        size = _batch_size(batch, size)
+        n_classes = len(self.constraints)
+        if self.attrs:
+            resolved = self._resolve_attr_rows(batch, size)
+        else:
+            resolved = self._resolve_constraint_rows(batch, size)
+        result = []
+        for i, klass in enumerate(resolved):
+            if klass is not None:
+                result.append(klass)
+                continue
+            result.append(self.resolve_type(_row(batch, i)))
+            if len(self.constraints) != n_classes:
+                # providers were imported -- resolve the rest from scratch
+                rest = {k: column[i + 1 :] for k, column in batch.items()}
+                result.extend(self.resolve_types(rest, size - i - 1))
+                break
+        return result
+
+    def _resolve_constraint_rows(
+        self, batch: Batch, size: int
+    ) -> list[Type | None]:
+        classes = list(self.constraints)
+        if not classes:
+            return [None] * size
+        masks = [
+            _to_mask(self.constraints[klass].evaluate_batch(batch, size))
+            for klass in classes
+        ]
+        np = _numpy()
+        if np is not None:
+            matrix = np.vstack(masks)
+            counts = matrix.sum(axis=0).tolist()
+            winners = matrix.argmax(axis=0).tolist()
+            return [
+                classes[w] if c == 1 else None for w, c in zip(winners, counts)
+            ]
+        resolved: list[Type | None] = []
+        for row in zip(*masks):
+            matches = [klass for klass, m in zip(classes, row) if m]
+            resolved.append(matches[0] if len(matches) == 1 else None)
+        return resolved
+
+    def _resolve_attr_rows(self, batch: Batch, size: int) -> list[Type | None]:
+        keys = zip(*(self._attr_column(batch, a, size) for a in self.attrs))
+        cache: dict[tuple, list[set[Type]]] = {}
+        masks: dict[Type, list[bool]] = {}
+        resolved: list[Type | None] = []
+        for i, key in enumerate(keys):
+            if any(v is _INVALID for v in key):
+                # resolved one by one to raise the error of resolve_type
+                resolved.append(None)
+                continue
+            try:
+                if key not in cache:
+                    cache[key] = list(self._attr_candidates(key))
+                tiers = cache[key]
+            except TypeError:
+                # unhashable values are left to resolve_type
+                tiers = []
+            matches = []
+            for candidates in tiers:
+                for klass in candidates:
+                    if klass in self._trivial:
+                        matches.append(klass)
+                        continue
+                    if klass not in masks:
+                        constraint = self.constraints[klass]
+                        mask = _to_mask(constraint.evaluate_batch(batch, size))
+                        masks[klass] = list(mask)
+                    if masks[klass][i]:
+                        matches.append(klass)
+                if matches:
+                    break
+            resolved.append(matches[0] if len(matches) == 1 else None)
+        return resolved
+
+    @staticmethod
+    def _attr_column(batch: Batch, attr: str, size: int) -> list:
+        column = batch.get(attr)
+        if column is not None or "." not in attr:
+            if column is None:
+                return [None] * size
+            return [None if v is MISSING else v for v in column]
+        head, _, tail = attr.partition(".")
+        parts = tail.split(".")
+        values = []
+        for v in batch.get(head, [MISSING] * size):
+            try:
+                # strict like the accessor of resolve_type
+                for part in parts:
+                    v = v[part]
+                values.append(v)
+            except Exception:
+                # resolved one by one to raise the error of resolve_type
+                values.append(_INVALID)
+        return values
+
+    def _attr_candidates(self, key: tuple) -> Iterator[set[Type]]:
+        # the classes of the exact key, then of the partial keys that
+        # replace values with wildcards, in order of specificity
+        candidates = self.index.get(key)
+        if candidates:
+            yield candidates
+        elif self._fallbacks and self._has_provider(key):
+            # the class a plugin provides for the exact key takes precedence
+            # over wildcard classes, resolve_type imports it first
+            return
+        for patterns in self._fallbacks:
+            candidates = set()
+            for pattern in patterns:
+                partial = tuple(
+                    MISSING if w else v for w, v in zip(pattern, key)
+                )
+                candidates.update(self.index.get(partial, ()))
+            if candidates:
+                yield candidates
+
+    def _has_provider(self, key: tuple) -> bool:
+        self.load_plugin_groups()
+        return bool(self.providers) and provider_key(key) in self.providers
+
+    def _match(self, val: dict) -> set[Type]:
+        if not self.attrs:
+            return {
+                klass
+                for klass, constraint in self.constraints.items()
+                if constraint.evaluate(val)
+            }
+        for candidates in self._attr_candidates(self._key(val)):
+            matches = {
+                klass
+                for klass in candidates
+                if klass in self._trivial
+                or self.constraints[klass].evaluate(val)
+            }
+            if matches:
+                return matches
+        return set()
+
     def dump(self, obj: Any) -> dict:
         data = to_dict(obj, dispatch=False)
         for a in self.attrs:
             if "." in a:
                 # these do not belong in the data for this object
                 continue
-            data[a] = getattr(obj, a)
+            value = getattr(obj, a, MISSING)
+            if value is not MISSING:
+                data[a] = value
         return data
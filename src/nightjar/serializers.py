@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import copy
 import sys
-from dataclasses import is_dataclass
+from dataclasses import MISSING, is_dataclass
 from datetime import date, datetime, time
 from pathlib import Path
 from typing import (
@@ -30,6 +30,85 @@ except ImportError:
 T = TypeVar("T")
 
 
+class LazyValue:
+    """Raw field data that is decoded on first access.
+
+    Parameters
+    ----------
+    typ : type
+        Type hint used to decode the raw data.
+    raw : Any
+        Raw (serialized) data of the field.
+    globalns, localns : Any, optional
+        Namespaces forwarded to :func:`from_dict`.
+    """
+
+    __slots__ = ("globalns", "localns", "raw", "resolved", "typ", "value")
+
+    def __init__(
+        self, typ: Any, raw: Any, globalns: Any = None, localns: Any = None
+    ) -> None:
+        self.typ = typ
+        self.raw = raw
+        self.globalns = globalns
+        self.localns = localns
+        self.resolved = False
+        self.value = None
+
+    def get(self) -> Any:
+        if not self.resolved:
+            self.value = from_dict(
+                self.typ,
+                self.raw,
+                globalns=self.globalns,
+                localns=self.localns,
+            )
+            self.resolved = True
+            # the raw data is no longer needed once decoded
+            self.raw = None
+        return self.value
+
+    def __reduce__(self) -> tuple:
+        # the namespaces are left out, type hints of fields are resolved
+        if not self.resolved:
+            return (LazyValue, (self.typ, self.raw))
+        state = {"resolved": True, "value": self.value}
+        return (LazyValue, (self.typ, None), (None, state))
+
+
+def is_nested_type(typ: Any) -> bool:
+    origin = get_origin(typ)
+    if origin is Union or origin is UnionType:
+        return any(
+            is_nested_type(t) for t in get_args(typ) if t is not type(None)
+        )
+    if origin is not None:
+        typ = origin
+    if is_dataclass(typ):
+        return True
+    return isinstance(typ, type) and issubclass(typ, (list, Mapping))
+
+
+def _copy_raw(val: Any) -> Any:
+    # copies the containers of raw data so that later changes to the input
+    # do not reach the config, other values are shared as when decoding
+    if type(val) is dict:
+        return {k: _copy_raw(v) for k, v in val.items()}
+    if type(val) is list:
+        return [_copy_raw(v) for v in val]
+    return val
+
+
+def decode_field(
+    klass: type, typ: Any, val: Any, globalns: Any = None, localns: Any = None
+) -> Any:
+    if getattr(klass, "__lazy__", False) and is_nested_type(typ):
+        return LazyValue(
+            typ, _copy_raw(val), globalns=globalns, localns=localns
+        )
+    return from_dict(typ, val, globalns=globalns, localns=localns)
+
+
 def evaluate_forwardref(typ: ForwardRef, globalns: Any, localns: Any) -> Any:
     if sys.version_info < (3, 9):
         return typ._evaluate(globalns, localns)
@@ -46,9 +125,15 @@ def _to_dict_inner(obj, dict_factory, dispatch: bool = True):
     if dispatch and hasattr(obj, "_dispatch_registry"):
         return obj.__class__._dispatch_registry.dump(obj)
     elif is_dataclass(obj):
+        lazy = getattr(obj, "__lazy__", False)
         result = []
         for fn in get_dataclass_type_hints(obj.__class__):
-            value = _to_dict_inner(getattr(obj, fn), dict_factory)
+            value = obj.__dict__.get(fn, MISSING) if lazy else MISSING
+            if isinstance(value, LazyValue) and not value.resolved:
+                # pass the raw subtree through without decoding it
+                value = _to_dict_inner(value.raw, dict_factory)
+            else:
+                value = _to_dict_inner(getattr(obj, fn), dict_factory)
             result.append((fn, value))
         return dict_factory(result)
     elif isinstance(obj, tuple):
@@ -71,6 +156,22 @@ def to_dict(obj, dispatch: bool = True):
     return _to_dict_inner(obj, dict, dispatch=dispatch)
 
 
+def json_default(obj: Any) -> Any:
+    """Encode the values of :func:`to_dict` that JSON does not support.
+
+    Use as the ``default`` argument of :func:`json.dumps`. The encoded
+    values are decoded back by :func:`from_dict` given the field types.
+    """
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Path):
+        return str(obj)
+    if isinstance(obj, tuple):
+        return list(obj)
+    msg = f"object of type {type(obj).__name__} is not JSON serializable"
+    raise TypeError(msg)
+
+
 def from_dict(
     typ: Type[T], val: Any, globalns: Any = None, localns: Any = None
 ) -> T:
@@ -96,6 +197,9 @@ def from_dict(
     if isinstance(typ, ForwardRef):
         typ = evaluate_forwardref(typ, globalns=globalns, localns=localns)
     if typ is UnionType or typ is Union:
+        if val is None and type(None) in type_args:
+            # not converted by the other types, e.g. str(None)
+            return None
         for subtype in type_args:
             try:
                 return from_dict(subtype, val)
@@ -133,7 +237,8 @@ def from_dict(
         if isinstance(val, Mapping):
             field_types = get_dataclass_type_hints(typ)
             kwargs = {
-                k: from_dict(
+                k: decode_field(
+                    typ,
                     field_types.get(k, Any),
                     v,
                     globalns=globalns,
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+import sys
+from collections import OrderedDict
+from multiprocessing import shared_memory
+from typing import Any, Generic, Type, TypeVar
+
+from nightjar.serializers import from_dict, json_default, to_dict
+
+__all__ = ["SharedConfig"]
+
+T = TypeVar("T")
+
+# maximum number of configs kept decoded per process
+MAX_DECODED = 16
+
+# configs decoded in this process keyed by the shared memory block name,
+# least recently loaded first
+_decoded: OrderedDict[str, Any] = OrderedDict()
+
+
+def _remember(name: str, config: Any) -> None:
+    _decoded[name] = config
+    _decoded.move_to_end(name)
+    while len(_decoded) > MAX_DECODED:
+        _decoded.popitem(last=False)
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        # the owner is responsible for unlinking the block
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+class SharedConfig(Generic[T]):
+    """Handle to a config serialized once into shared memory.
+
+    The handle only holds the name and size of the shared memory block and
+    the config class, so sending it to worker processes costs the same
+    regardless of the size of the config. Every process, including the one
+    that created the block, decodes the config from the block on the first
+    call to :meth:`load` and reuses it for every later task. Each
+    process keeps the :data:`MAX_DECODED` most recently loaded configs,
+    and :meth:`release` drops one earlier.
+
+    Parameters
+    ----------
+    name : str
+        Name of the shared memory block.
+    size : int
+        Number of bytes of serialized data in the block.
+    config_class : type
+        Config class used to decode the data.
+
+    Examples
+    --------
+    >>> with SharedConfig.create(config) as handle:  # doctest: +SKIP
+    ...     pool.map(train, [(handle, seed) for seed in range(100)])
+    >>> def train(args):  # doctest: +SKIP
+    ...     handle, seed = args
+    ...     config = handle.load()
+    """
+
+    def __init__(self, name: str, size: int, config_class: Type[T]) -> None:
+        self.name = name
+        self.size = size
+        self.config_class = config_class
+        self._shm: shared_memory.SharedMemory | None = None
+
+    @classmethod
+    def create(
+        cls, config: T, config_class: Type[T] | None = None
+    ) -> SharedConfig[T]:
+        """Serialize a config into a new shared memory block.
+
+        Parameters
+        ----------
+        config : BaseConfig
+            The config to share.
+        config_class : type, optional
+            Config class used to decode the data, defaults to the class of
+            the config.
+
+        Returns
+        -------
+        SharedConfig
+            Handle that owns the block, call :meth:`unlink` (or use it as a
+            context manager) to release the block.
+        """
+        if config_class is None:
+            config_class = type(config)
+        data = json.dumps(to_dict(config), default=json_default).encode(
+            "utf-8"
+        )
+        shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+        shm.buf[: len(data)] = data
+        self = cls(shm.name, len(data), config_class)
+        self._shm = shm
+        return self
+
+    def load(self) -> T:
+        """Return the config, decoding it once per process.
+
+        Returns
+        -------
+        BaseConfig
+            The shared config. It is shared by every task of the process and
+            should not be modified in place.
+        """
+        config = _decoded.get(self.name)
+        if config is None:
+            shm = _attach(self.name)
+            try:
+                data = json.loads(bytes(shm.buf[: self.size]))
+            finally:
+                shm.close()
+            config = from_dict(self.config_class, data)
+        _remember(self.name, config)
+        return config
+
+    def release(self) -> None:
+        """Drop the config decoded by this process, valid in any process.
+
+        A later :meth:`load` decodes the config again while the block
+        exists.
+        """
+        _decoded.pop(self.name, None)
+
+    def close(self) -> None:
+        """Close the block in the owning process without releasing it."""
+        if self._shm is not None:
+            self._shm.close()
+
+    def unlink(self) -> None:
+        """Release the block, only valid in the owning process."""
+        if self._shm is None:
+            msg = (
+                "only the process that created the shared config can unlink it"
+            )
+            raise ValueError(msg)
+        self.release()
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __reduce__(self) -> tuple:
+        return (type(self), (self.name, self.size, self.config_class))
+
+    def __enter__(self) -> SharedConfig[T]:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        if self._shm is not None:
+            self.unlink()
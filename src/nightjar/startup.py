@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import threading
+import time
+import typing
+from concurrent.futures import Future
+from dataclasses import dataclass, is_dataclass
+from typing import Any, Iterator
+
+from nightjar.base import (
+    BaseConfig,
+    _config_annotation,
+    _load_module_entry_points,
+    dispatch_map,
+)
+from nightjar.utils import get_dataclass_type_hints
+
+__all__ = ["WarmupReport", "warmup"]
+
+
+@dataclass(frozen=True)
+class WarmupReport:
+    """Summary of what :func:`warmup` prepared.
+
+    Attributes
+    ----------
+    classes : int
+        Number of config and dataclass types whose type hints were resolved.
+    families : int
+        Number of dispatch registries that were prepared.
+    modules : int
+        Number of module classes whose config annotation was resolved.
+    seconds : float
+        Wall time of the warmup.
+    """
+
+    classes: int
+    families: int
+    modules: int
+    seconds: float
+
+
+def _subclasses(cls: type) -> Iterator[type]:
+    for sub in cls.__subclasses__():
+        yield sub
+        yield from _subclasses(sub)
+
+
+def _nested_types(hint: Any) -> Iterator[type]:
+    # dataclass types that appear in a type hint
+    if isinstance(hint, type) and is_dataclass(hint):
+        yield hint
+    for arg in typing.get_args(hint):
+        yield from _nested_types(arg)
+
+
+def _warmup() -> WarmupReport:
+    start = time.perf_counter()
+    pending = list(dispatch_map)
+    pending.extend(_subclasses(BaseConfig))
+    registries = {}
+    seen: set[type] = set()
+    while pending:
+        cls = pending.pop()
+        if cls in seen or "__overlay_of__" in vars(cls):
+            continue
+        try:
+            hints = get_dataclass_type_hints(cls)
+        except NameError:
+            # unresolvable forward references fail on first use as well
+            continue
+        seen.add(cls)
+        for hint in hints.values():
+            pending.extend(_nested_types(hint))
+        if not hasattr(cls, "_dispatch_registry"):
+            continue
+        registry = cls._dispatch_registry
+        if id(registry) not in registries:
+            registries[id(registry)] = registry
+            pending.extend(registry.constraints)
+    for registry in registries.values():
+        _ = registry.discriminators
+        registry.load_plugin_groups()
+    _load_module_entry_points()
+    modules = set().union(*dispatch_map.values())
+    for module in modules:
+        _config_annotation(module)
+    return WarmupReport(
+        classes=len(seen),
+        families=len(registries),
+        modules=len(modules),
+        seconds=time.perf_counter() - start,
+    )
+
+
+def warmup(
+    background: bool = False,
+) -> WarmupReport | Future[WarmupReport]:
+    """Resolve the type information of all registered classes ahead of time.
+
+    The first decoding of each config family otherwise resolves type hints,
+    dispatch metadata and entry points on demand. Calling this at startup
+    (after the config and module classes are imported) moves that work out
+    of the first request.
+
+    Parameters
+    ----------
+    background : bool, default=False
+        Whether to run the warmup in a daemon thread.
+
+    Returns
+    -------
+    WarmupReport or concurrent.futures.Future
+        The report, or a future of the report if ``background`` is set.
+
+    Notes
+    -----
+    Plugin entry points are read, but the modules they provide are still
+    imported on demand.
+
+    Examples
+    --------
+    >>> report = nightjar.warmup()  # doctest: +SKIP
+    >>> print(f"prepared {report.classes} classes in {report.seconds:.3f}s")  # doctest: +SKIP
+    """
+    if not background:
+        return _warmup()
+    future: Future[WarmupReport] = Future()
+
+    def run() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(_warmup())
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="nightjar-warmup", daemon=True).start()
+    return future
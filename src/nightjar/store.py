@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import MISSING
+from typing import Any, Generic, Type, TypeVar
+
+from nightjar.serializers import from_dict, json_default, to_dict
+from nightjar.utils import qualname
+
+__all__ = ["ConfigStore"]
+
+T = TypeVar("T")
+
+MAGIC = b"NJSTORE1"
+# offset and length of the index, followed by the magic number
+FOOTER = struct.Struct("<QQ8s")
+
+
+def _instance_value(obj: Any, attr: str) -> Any:
+    # MISSING when the config has no value for the (dotted) attribute
+    for part in attr.split("."):
+        obj = getattr(obj, part, MISSING)
+        if obj is MISSING:
+            return MISSING
+    return obj
+
+
+def _index_key(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, default=json_default)
+
+
+class ConfigStore(Mapping[str, T], Generic[T]):
+    """Read-only store of serialized configs backed by a memory map.
+
+    Records are decoded with :func:`nightjar.serializers.from_dict` only when
+    they are accessed, so opening a store only reads its offset index.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        Path of a store written by :meth:`ConfigStore.write`.
+    config_class : type
+        Config class (usually the root of a dispatch family) used to decode
+        the records.
+
+    Examples
+    --------
+    >>> ConfigStore.write("configs.njs", {"a": cfg}, index=True)  # doctest: +SKIP
+    >>> with ConfigStore("configs.njs", VehicleConfig) as store:  # doctest: +SKIP
+    ...     cars = [store[i] for i in store.lookup("type", "car")]
+    """
+
+    def __init__(self, path: str | os.PathLike, config_class: Type[T]) -> None:
+        self.path = path
+        self.config_class = config_class
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic = None
+        if len(self._mmap) >= len(MAGIC) + FOOTER.size:
+            offset, length, magic = FOOTER.unpack_from(
+                self._mmap, len(self._mmap) - FOOTER.size
+            )
+        if magic != MAGIC or self._mmap[: len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            msg = f"not a config store file {os.fspath(path)!r}"
+            raise ValueError(msg)
+        try:
+            index = json.loads(self._mmap[offset : offset + length])
+            records = index["records"]
+            classes = index["classes"]
+            values = index["values"]
+        except Exception:
+            # corrupt index, closed as for a bad magic number
+            self._mmap.close()
+            raise
+        self._records: dict[str, list[int]] = records
+        self._classes: dict[str, list[str]] = classes
+        self._values: dict[str, dict[str, list[str]]] | None = values
+
+    @classmethod
+    def write(
+        cls,
+        path: str | os.PathLike,
+        configs: Mapping[str, Any] | Iterable[tuple[str, Any]],
+        index: bool = False,
+    ) -> None:
+        """Serialize configs into a store file.
+
+        Parameters
+        ----------
+        path : str or os.PathLike
+            Path of the store file to create.
+        configs : Mapping or Iterable of (str, config) pairs
+            Configs to store keyed by their ID.
+        index : bool, default=False
+            Whether to build a secondary index on the dispatch attribute
+            values of the configs, see :meth:`lookup`.
+        """
+        if isinstance(configs, Mapping):
+            configs = configs.items()
+        records: dict[str, list[int]] = {}
+        classes: dict[str, list[str]] = {}
+        values: dict[str, dict[str, list[str]]] = {}
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            offset = len(MAGIC)
+            for key, config in configs:
+                data = json.dumps(
+                    to_dict(config), default=json_default
+                ).encode("utf-8")
+                f.write(data)
+                records[key] = [offset, len(data)]
+                offset += len(data)
+                config_class = type(config)
+                classes.setdefault(qualname(config_class), []).append(key)
+                registry = getattr(config_class, "_dispatch_registry", None)
+                if not index or registry is None:
+                    continue
+                for a in registry.attrs:
+                    value = _instance_value(config, a)
+                    if value is MISSING:
+                        continue
+                    value = _index_key(value)
+                    values.setdefault(a, {}).setdefault(value, []).append(key)
+            data = json.dumps({
+                "records": records,
+                "classes": classes,
+                "values": values if index else None,
+            }).encode("utf-8")
+            f.write(data)
+            f.write(FOOTER.pack(offset, len(data), MAGIC))
+
+    def __getitem__(self, key: str) -> T:
+        offset, length = self._records[key]
+        data = json.loads(self._mmap[offset : offset + length])
+        return from_dict(self.config_class, data)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._records
+
+    def lookup(self, attr: str, value: Any) -> list[str]:
+        """Return the IDs of the configs with a dispatch attribute value.
+
+        Parameters
+        ----------
+        attr : str
+            Name of a dispatch attribute of the config family.
+        value : Any
+            Value of the dispatch attribute.
+
+        Returns
+        -------
+        list of str
+            IDs of the matching configs.
+
+        Raises
+        ------
+        ValueError
+            If the store was written without an index.
+        """
+        if self._values is None:
+            msg = "config store was written without a dispatch attribute index"
+            raise ValueError(msg)
+        return list(self._values.get(attr, {}).get(_index_key(value), []))
+
+    def of_type(self, config_class: type) -> list[str]:
+        """Return the IDs of the configs that are instances of a class.
+
+        Parameters
+        ----------
+        config_class : type
+            The config class, subclasses are included.
+
+        Returns
+        -------
+        list of str
+            IDs of the matching configs.
+        """
+        registry = getattr(config_class, "_dispatch_registry", None)
+        subclasses = [config_class]
+        if registry is not None:
+            subclasses.extend(
+                c
+                for c in registry.constraints
+                if c is not config_class and issubclass(c, config_class)
+            )
+        keys: list[str] = []
+        for c in subclasses:
+            keys.extend(self._classes.get(qualname(c), []))
+        return keys
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self) -> ConfigStore[T]:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import dataclasses
+import math
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import fields, is_dataclass
+from typing import Any, Generic, Tuple, TypeVar, overload
+
+from nightjar.serializers import from_dict
+from nightjar.utils import get_dataclass_type_hints, redispatch, split_paths
+
+__all__ = ["Sweep"]
+
+T = TypeVar("T")
+
+# an axis value, identified by the axis path and the index of the value
+Token = Tuple[str, int]
+
+
+def _copy(obj: Any) -> Any:
+    # copies the field values only, nested values are shared
+    klass = type(obj)
+    new = object.__new__(klass)
+    state = obj.__dict__
+    new.__dict__.update({
+        f.name: state[f.name] for f in fields(klass) if f.name in state
+    })
+    return new
+
+
+class Sweep(Sequence[T], Generic[T]):
+    """Lazy parameter sweep over a config.
+
+    Every point of the sweep is the base config with one value of each axis
+    applied. Points are built on access, so the sweep can be iterated,
+    indexed and sharded without materializing the grid. Subtrees that an
+    axis does not touch are shared with the base config, and every axis
+    value is decoded only once per target class.
+
+    Parameters
+    ----------
+    base : BaseConfig
+        The config that the axes are applied to.
+    axes : Mapping of str to Sequence
+        Values of each axis keyed by the dotted path of the field. A value
+        may be a raw (dict) value or a config, so an axis over a nested
+        config field switches the dispatched subclass. Overriding a
+        discriminator of a dispatch family re-resolves the class.
+
+    Notes
+    -----
+    Points share unchanged and decoded subtrees with each other and with
+    the base config, so they should not be modified in place.
+
+    Examples
+    --------
+    >>> sweep = Sweep(
+    ...     base,
+    ...     {
+    ...         "optimizer": [{"name": "sgd"}, {"name": "adam"}],
+    ...         "optimizer.lr": [0.1, 0.01],
+    ...     },
+    ... )  # doctest: +SKIP
+    >>> len(sweep)  # doctest: +SKIP
+    4
+    >>> for config in sweep.shard(worker_id, num_workers):  # doctest: +SKIP
+    ...     run(config)
+    """
+
+    def __init__(self, base: T, axes: Mapping[str, Sequence[Any]]) -> None:
+        self.base = base
+        self.axes = {path: list(values) for path, values in axes.items()}
+        self._sizes = [len(values) for values in self.axes.values()]
+        self._indices = range(math.prod(self._sizes))
+        self._decoded: dict[tuple[Token, type], Any] = {}
+
+    def _view(self, indices: range) -> Sweep[T]:
+        view = object.__new__(type(self))
+        view.__dict__.update(self.__dict__)
+        view._indices = indices
+        return view
+
+    def shard(self, index: int, count: int) -> Sweep[T]:
+        """Return the points of one of ``count`` interleaved shards.
+
+        Parameters
+        ----------
+        index : int
+            Index of the shard, between 0 and ``count - 1``.
+        count : int
+            Number of shards.
+
+        Returns
+        -------
+        Sweep
+            A sweep over the points of the shard.
+        """
+        if not 0 <= index < count:
+            msg = f"shard index {index} is out of range for {count} shards"
+            raise ValueError(msg)
+        return self._view(self._indices[index::count])
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sweep[T]: ...
+
+    def __getitem__(self, index: int | slice) -> T | Sweep[T]:
+        if isinstance(index, slice):
+            return self._view(self._indices[index])
+        return self._point(self._tokens(self._indices[index]))
+
+    def __iter__(self) -> Iterator[T]:
+        for n in self._indices:
+            yield self._point(self._tokens(n))
+
+    def params(self, index: int) -> dict[str, Any]:
+        """Return the axis values of a point.
+
+        Parameters
+        ----------
+        index : int
+            Index of the point in the sweep.
+
+        Returns
+        -------
+        dict
+            The (raw) value of every axis keyed by its path.
+        """
+        tokens = self._tokens(self._indices[index])
+        return {path: self.axes[path][j] for path, j in tokens.values()}
+
+    def _tokens(self, n: int) -> dict[str, Token]:
+        # the last axis varies fastest, as in itertools.product
+        choices = []
+        for size in reversed(self._sizes):
+            n, j = divmod(n, size)
+            choices.append(j)
+        choices.reverse()
+        return {path: (path, j) for path, j in zip(self.axes, choices)}
+
+    def _point(self, tokens: dict[str, Token]) -> T:
+        return self._apply(self.base, tokens)
+
+    def _decode(self, klass: type, name: str, token: Token) -> Any:
+        key = (token, klass)
+        if key in self._decoded:
+            return self._decoded[key]
+        hints = get_dataclass_type_hints(klass)
+        if name not in hints:
+            msg = f"{klass.__name__} has no field named {name}"
+            raise ValueError(msg)
+        path, j = token
+        value = self.axes[path][j]
+        if not is_dataclass(value) or isinstance(value, type):
+            value = from_dict(hints[name], value)
+        self._decoded[key] = value
+        return value
+
+    def _apply(self, obj: Any, tokens: dict[str, Token]) -> Any:
+        direct, nested = split_paths(tokens)
+        klass = type(obj)
+        registry = getattr(klass, "_dispatch_registry", None)
+        if registry is None:
+            return self._replace(obj, direct, nested)
+        names = registry.discriminators
+        new = None
+        if direct and (names is None or not names.isdisjoint(direct)):
+            values = {name: self.axes[p][j] for name, (p, j) in direct.items()}
+            new = redispatch(
+                obj,
+                klass,
+                values,
+                lambda new_klass, name: self._decode(
+                    new_klass, name, direct[name]
+                ),
+            )
+        if new is None:
+            new = _copy(obj)
+            hints = get_dataclass_type_hints(klass) if direct else {}
+            for name, token in direct.items():
+                if name not in hints and name in registry.attrs:
+                    # the class did not change, so the value is in effect
+                    continue
+                setattr(new, name, self._decode(klass, name, token))
+        for name, sub_tokens in nested.items():
+            setattr(new, name, self._apply(getattr(new, name), sub_tokens))
+        return new
+
+    def _replace(
+        self,
+        obj: Any,
+        direct: dict[str, Token],
+        nested: dict[str, dict[str, Token]],
+    ) -> Any:
+        klass = type(obj)
+        if not is_dataclass(obj) or isinstance(obj, type):
+            msg = f"cannot override fields of a {klass.__name__} value"
+            raise ValueError(msg)
+        # plain dataclasses are copied, their fields are still shared
+        changes = {
+            name: self._decode(klass, name, token)
+            for name, token in direct.items()
+        }
+        for name, sub_tokens in nested.items():
+            current = changes.get(name, getattr(obj, name))
+            changes[name] = self._apply(current, sub_tokens)
+        return dataclasses.replace(obj, **changes)
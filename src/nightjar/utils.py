@@ -4,12 +4,14 @@ import functools
 import sys
 import types
 import typing
+from collections.abc import Callable, Mapping
 from dataclasses import fields
-from typing import Annotated, Any, get_origin
+from typing import Annotated, Any, TypeVar, get_origin
 
 __all__ = [
     "get_annotations",
     "get_dataclass_type_hints",
+    "get_entry_points",
 ]
 
 
@@ -20,6 +22,7 @@ class ONLY_IF_ALL_STR_type:  # noqa: N801
 
 ONLY_IF_ALL_STR = ONLY_IF_ALL_STR_type()
 NoneType = type(None)
+V = TypeVar("V")
 
 
 def get_annotations(
@@ -130,6 +133,18 @@ def get_annotations(
 
 
 def get_dataclass_type_hints(cls, globalns: Any = None, localns: Any = None):
+    if globalns is None and localns is None:
+        # the result is shared, callers must not modify it
+        return _cached_dataclass_type_hints(cls)
+    return _dataclass_type_hints(cls, globalns, localns)
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_dataclass_type_hints(cls):
+    return _dataclass_type_hints(cls, None, None)
+
+
+def _dataclass_type_hints(cls, globalns: Any, localns: Any):
     types = {}
     hints = typing.get_type_hints(cls, globalns=globalns, localns=localns)
     for field in fields(cls):
@@ -139,5 +154,108 @@ def get_dataclass_type_hints(cls, globalns: Any = None, localns: Any = None):
     return types
 
 
+def qualname(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def split_paths(
+    overrides: Mapping[str, V],
+) -> tuple[dict[str, V], dict[str, dict[str, V]]]:
+    # values of the fields of the object, and of the fields of its fields
+    # keyed by field name and the rest of their dotted path
+    direct: dict[str, V] = {}
+    nested: dict[str, dict[str, V]] = {}
+    for path, value in overrides.items():
+        head, _, tail = path.partition(".")
+        if tail:
+            nested.setdefault(head, {})[tail] = value
+        else:
+            direct[head] = value
+    return direct, nested
+
+
+def redispatch(
+    obj: Any,
+    klass: type,
+    values: Mapping[str, Any],
+    decode: Callable[[type, str], Any],
+) -> Any:
+    """Rebuild a config of a dispatch family with some fields changed.
+
+    Parameters
+    ----------
+    obj : Any
+        The config, whose fields are read as attributes.
+    klass : type
+        The class of the config.
+    values : Mapping of str to Any
+        Raw values of the changed fields, used to resolve the class.
+    decode : callable
+        Called with the resolved class and the name of a changed field to
+        get its decoded value.
+
+    Returns
+    -------
+    Any
+        A config of the resolved class that shares the unchanged field
+        values of ``obj``, or None if the class does not change.
+
+    Raises
+    ------
+    ValueError
+        If a changed field is neither a field of the resolved class nor a
+        dispatch attribute of the family.
+    """
+    registry = klass._dispatch_registry
+    data = {f.name: getattr(obj, f.name) for f in fields(klass)}
+    for a in registry.attrs:
+        if "." not in a:
+            data.setdefault(a, getattr(obj, a, None))
+    data.update(values)
+    new_klass = registry.resolve_type(data)
+    field_names = {f.name for f in fields(new_klass)}
+    for name in values:
+        if name not in field_names and name not in registry.attrs:
+            msg = f"{new_klass.__name__} has no field named {name}"
+            raise ValueError(msg)
+    if new_klass is klass:
+        return None
+    old_names = {f.name for f in fields(klass)}
+    kwargs = {}
+    for f in fields(new_klass):
+        if not f.init:
+            continue
+        if f.name in values:
+            kwargs[f.name] = decode(new_klass, f.name)
+        elif f.name in old_names:
+            kwargs[f.name] = getattr(obj, f.name)
+    return new_klass(**kwargs)
+
+
 def is_annotated(type_hint):
     return get_origin(type_hint) is Annotated
+
+
+def get_entry_points(group: str) -> dict[str, str]:
+    """Return the entry points of a group as a name to module mapping.
+
+    Parameters
+    ----------
+    group : str
+        Name of the entry point group.
+
+    Returns
+    -------
+    dict[str, str]
+        Mapping from entry point name to the module that provides it. The
+        object reference part of an entry point value is ignored.
+    """
+    # imported here, importlib.metadata is slow to import and entry points
+    # are only read once a lookup fails
+    import importlib.metadata  # noqa: PLC0415
+
+    if sys.version_info < (3, 10):
+        eps = importlib.metadata.entry_points().get(group, [])
+    else:
+        eps = importlib.metadata.entry_points(group=group)
+    return {ep.name: ep.value.partition(":")[0].strip() for ep in eps}
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import importlib
+import re
+import sys
+import textwrap
+
+import pytest
+
+from nightjar.compiler import compile_module
+from nightjar.serializers import from_dict, to_dict
+
+CONFIGS = textwrap.dedent(
+    """
+    from typing import Dict, List, Optional
+
+    from nightjar import BaseConfig
+
+
+    class LayerConfig(BaseConfig, dispatch="kind"):
+        pass
+
+
+    class DenseConfig(LayerConfig):
+        kind = "dense"
+        units: int = 1
+        tag: Optional[str] = None
+
+
+    class ConvConfig(LayerConfig):
+        kind = "conv"
+        size: List[int] = None
+
+
+    class ModelBase(BaseConfig):
+        pass
+
+
+    class ModelConfig(ModelBase):
+        name: str = ""
+        layers: List[LayerConfig] = None
+        named: Dict[str, LayerConfig] = None
+        head: Optional[LayerConfig] = None
+        ratio: float = 0.5
+    """
+)
+
+DATA = [
+    {
+        "name": "m",
+        "layers": [
+            {"kind": "dense", "units": 3, "tag": None},
+            {"kind": "dense", "units": "4", "tag": "x"},
+            {"kind": "conv", "size": [3, 3]},
+        ],
+        "named": {"a": {"kind": "conv", "size": []}},
+        "head": None,
+        "ratio": 1,
+    },
+    {"name": "n", "head": {"kind": "dense"}},
+    {},
+]
+
+
+@pytest.fixture
+def modules(tmp_path, monkeypatch):
+    (tmp_path / "compiled_configs.py").write_text(CONFIGS)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield importlib.import_module("compiled_configs"), tmp_path
+    sys.modules.pop("compiled_configs", None)
+    sys.modules.pop("compiled_configs_compiled", None)
+
+
+def _import_compiled(tmp_path, configs, source):
+    (tmp_path / f"{configs.__name__}_compiled.py").write_text(source)
+    return importlib.import_module(f"{configs.__name__}_compiled")
+
+
+@pytest.mark.parametrize("data", DATA)
+def test_compiled_round_trip(modules, data):
+    configs, tmp_path = modules
+    compiled = _import_compiled(
+        tmp_path, configs, compile_module(configs.__name__)
+    )
+    assert compiled.VALID
+    expected = from_dict(configs.ModelBase, data)
+    config = compiled.from_dict(configs.ModelBase, data)
+    assert config == expected
+    assert compiled.to_dict(config) == to_dict(expected)
+
+
+def test_compiled_optional_str_none(modules):
+    configs, tmp_path = modules
+    compiled = _import_compiled(
+        tmp_path, configs, compile_module(configs.__name__)
+    )
+    data = {"kind": "dense", "tag": None}
+    assert compiled.from_dict(configs.LayerConfig, data).tag is None
+    assert from_dict(configs.LayerConfig, data).tag is None
+
+
+def test_stale_signature_uses_dynamic_path(modules):
+    configs, tmp_path = modules
+    source = compile_module(configs.__name__)
+    # as if the config classes changed after the module was compiled
+    source = re.sub(
+        r"^SIGNATURE = .*$", "SIGNATURE = 'stale'", source, flags=re.M
+    )
+    compiled = _import_compiled(tmp_path, configs, source)
+    assert not compiled.VALID
+    for data in DATA:
+        expected = from_dict(configs.ModelBase, data)
+        config = compiled.from_dict(configs.ModelBase, data)
+        assert config == expected
+        assert compiled.to_dict(config) == to_dict(expected)
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import io
+import json
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from nightjar import BaseConfig
+from nightjar.jsonio import from_json
+from nightjar.serializers import from_dict
+
+
+class JsonLayer(BaseConfig, dispatch="kind"):
+    pass
+
+
+class JsonDense(JsonLayer):
+    kind = "dense"
+    units: int = 1
+    tag: Optional[str] = None
+
+
+class JsonConv(JsonLayer):
+    kind = "conv"
+    size: List[int] = None
+
+
+class JsonNode(BaseConfig, dispatch="kind"):
+    pass
+
+
+class JsonTree(JsonNode):
+    kind = "tree"
+    value: int = 0
+    child: Optional[JsonNode] = None
+    children: List[JsonNode] = None
+
+
+class JsonModelBase(BaseConfig):
+    pass
+
+
+class JsonModel(JsonModelBase):
+    name: str = ""
+    layers: List[JsonLayer] = None
+    named: Dict[str, JsonLayer] = None
+    head: Optional[JsonLayer] = None
+    root: Optional[JsonNode] = None
+    extra: Any = None
+
+
+def _tree(depth: int) -> dict:
+    node = {"kind": "tree", "value": 0}
+    for i in range(depth):
+        node = {"kind": "tree", "value": i, "child": node, "children": []}
+    return node
+
+
+VALID = [
+    {},
+    {"name": "m", "layers": [], "named": {}, "head": None},
+    {
+        "name": "m",
+        "layers": [
+            {"kind": "dense", "units": 2, "tag": None},
+            {"kind": "conv", "size": [3, 3]},
+            {"units": 4, "kind": "dense", "tag": "x"},
+        ],
+        "named": {"a": {"kind": "conv", "size": []}},
+        "head": {"kind": "dense"},
+    },
+    # members the resolved class has no field for are ignored
+    {"name": "m", "unknown": {"a": [1, {"b": "}"}]}, "layers": []},
+    {"layers": [{"kind": "dense", "unknown": [1, 2]}]},
+    {"extra": {"x": [1, 2.5, "y", None, True]}},
+    {"name": 'a " ] } \\ b', "extra": "é😀"},
+    {"root": _tree(40)},
+    {"root": {"kind": "tree", "children": [_tree(2), _tree(3)]}},
+]
+
+
+@pytest.mark.parametrize("data", VALID)
+def test_from_json_matches_from_dict(data):
+    expected = from_dict(JsonModelBase, data)
+    document = json.dumps(data)
+    assert from_json(JsonModelBase, document) == expected
+    assert from_json(JsonModelBase, json.dumps(data, indent=2)) == expected
+    assert from_json(JsonModelBase, document.encode("utf-8")) == expected
+    assert from_json(JsonModelBase, io.StringIO(document)) == expected
+
+
+def test_from_json_decodes_top_level_containers():
+    document = json.dumps([{"kind": "dense"}, {"kind": "conv", "size": [1]}])
+    expected = from_dict(List[JsonLayer], json.loads(document))
+    assert from_json(List[JsonLayer], document) == expected
+
+
+INVALID = [
+    "",
+    "{",
+    '{"name": "m"} x',
+    '{"name": "m",}',
+    '{"layers": [}',
+    '{"layers": [1 2]}',
+    '{"layers": [{"kind": "dense", "units": 1,}]}',
+    '{"layers": [], "junk": [1,,2]}',
+    '{"layers": [{"kind": "dense", "zz": {"a": tru}}]}',
+    '{"name": "m", "extra": {"a" 1}}',
+    '{"name": "unterminated}',
+    '{"root": {"kind": "tree", "child": {"kind": "tree",}}}',
+    "﻿{}",
+]
+
+
+@pytest.mark.parametrize("document", INVALID)
+def test_from_json_rejects_invalid_json(document):
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(document)
+    with pytest.raises(json.JSONDecodeError):
+        from_json(JsonModelBase, document)
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        '{"layers": [{"kind": "pool"}]}',
+        '{"head": {"units": 1}}',
+        '{"root": {"kind": "tree", "child": {"kind": "leaf"}}}',
+    ],
+)
+def test_from_json_raises_dispatch_errors_like_from_dict(document):
+    with pytest.raises(ValueError) as expected:
+        from_dict(JsonModelBase, json.loads(document))
+    with pytest.raises(ValueError) as error:
+        from_json(JsonModelBase, document)
+    assert str(error.value) == str(expected.value)